@@ -0,0 +1,118 @@
+# Encoding time of a GET /projects page with each JSON provider
+#
+# Builds a page of `--projects` parsed projects, each with mediators, funders,
+# subjects and deliverables, and times how long connexion's default jsonifier
+# (flask.json with indent=2) and the providers of lib/json_provider.py take to
+# encode it, and to decode it again as response validation does
+#
+# Usage: python benchmarks/json_encoding.py [--projects 100] [--funders 10]
+#                                           [--iterations 200]
+
+from __future__ import annotations
+from typing import Callable
+
+import argparse
+import datetime
+import uuid
+import time
+import sys
+
+import flask
+from connexion.apps.flask_app import FlaskJSONEncoder
+from connexion.jsonifier import Jsonifier
+
+sys.path.append("src")
+
+from lib import json_provider
+from model import Project, User, Subject, Deliverable, Funding
+
+
+def user(i: int) -> User:
+    return User(
+        email=f"user{i}@email.com",
+        stake_address=f"stake_test1{i:056d}",
+        payment_address=f"addr_test1{i:098d}",
+        nft_identifier_policy=f"{i:056x}",
+    )
+
+
+def page(projects: int, funders: int) -> dict:
+    # Same shape as get_projects returns
+    users = [user(i) for i in range(funders + 3)]
+
+    return {
+        "count": projects,
+        "projects": [
+            Project(
+                project_identifier=str(uuid.UUID(int=i)),
+                name=f"Project {i}",
+                creator=users[0],
+                mediators=users[1:3],
+                funding=[
+                    Funding(
+                        funder=funder,
+                        transaction_hash=f"{i:064x}",
+                        transaction_index=0,
+                        amount=10_000_000,
+                        status="onchain",
+                    )
+                    for funder in users[3:]
+                ],
+                total_funding_amount=10_000_000 * funders,
+                short_description="lorem ipsum dolor sit amet " * 4,
+                long_description="lorem ipsum dolor sit amet " * 40,
+                subjects=[Subject(subject_name="Math"), Subject(subject_name="Tourism")],
+                deliverables=[
+                    Deliverable(deliverable=f"Deliverable {j}") for j in range(5)
+                ],
+                days_to_complete=15,
+                creation_date=datetime.datetime(2022, 6, 24, 12, 0, 0),
+            ).parse()
+            for i in range(projects)
+        ],
+    }
+
+
+def run(operation: Callable[[], object], iterations: int) -> float:
+    operation()  # Warm up
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--funders", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    data = page(args.projects, args.funders)
+
+    app = flask.Flask(__name__)
+    app.json_encoder = FlaskJSONEncoder
+
+    jsonifiers = {
+        "connexion": Jsonifier(flask.json, indent=2),
+        **{name: json_provider.get_jsonifier(name) for name in json_provider.providers},
+    }
+
+    print(f"{'provider':<12} {'encode ms':>10} {'decode ms':>10} {'size KiB':>9}")
+    with app.app_context():
+        for name, jsonifier in jsonifiers.items():
+            encoded = jsonifier.dumps(data)
+
+            encode = run(lambda: jsonifier.dumps(data), args.iterations)
+            decode = run(lambda: jsonifier.loads(encoded), args.iterations)
+
+            print(
+                f"{name:<12} {encode * 1000:>10.2f} {decode * 1000:>10.2f}"
+                f" {len(encoded.encode('utf-8')) / 1024:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
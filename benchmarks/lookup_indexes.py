@@ -0,0 +1,146 @@
+# Lookup latency of the identifier indexes on a seeded database
+#
+# Seeds quiz assignments (one per user/quiz pair) and times the lookups the
+# API does with and without their index
+#
+# Usage: python benchmarks/lookup_indexes.py [--rows 1000000] [--db sqlite://]
+# The database defaults to DB_CONN and it must be empty, tables are created
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+import uuid
+import sys
+import os
+
+from sqlalchemy import create_engine, select
+
+sys.path.append("src")
+
+from model import db, User, Quiz, QuizAssignment
+
+
+LOOKUPS = 1_000
+BATCH_SIZE = 10_000
+
+
+def seed(engine, rows: int):
+    side = int(rows**0.5)
+    now = datetime.datetime.utcnow()
+
+    with engine.begin() as conn:
+        conn.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "id": i + 1,
+                    "stake_address": f"stake_test{i}",
+                    "email": f"user{i}@email.com",
+                    "payment_address": f"addr_test{i}",
+                    "creation_date": now,
+                }
+                for i in range(side)
+            ],
+        )
+        conn.execute(
+            Quiz.__table__.insert(),
+            [
+                {
+                    "id": i + 1,
+                    "quiz_identifier": str(uuid.uuid4()),
+                    "creator_name": "Alice",
+                    "questions": [],
+                    "current_limit": 100,
+                    "version": 1,
+                    "creation_date": now,
+                }
+                for i in range(side)
+            ],
+        )
+
+    identifiers = []
+    batch = []
+    for quiz_id in range(1, side + 1):
+        for assignee_id in range(1, side + 1):
+            identifier = str(uuid.uuid4())
+            identifiers.append(identifier)
+            batch.append(
+                {
+                    "quiz_assignment_identifier": identifier,
+                    "quiz_id": quiz_id,
+                    "assignee_id": assignee_id,
+                    "current_question": 0,
+                    "remaining_attempts": 3,
+                    "creation_date": now,
+                }
+            )
+
+            if len(batch) == BATCH_SIZE:
+                with engine.begin() as conn:
+                    conn.execute(QuizAssignment.__table__.insert(), batch)
+                batch = []
+
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(QuizAssignment.__table__.insert(), batch)
+
+    return side, identifiers
+
+
+def time_lookups(engine, statements) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for statement in statements:
+            conn.execute(statement).first()
+
+        return (time.perf_counter() - start) / len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", default=os.environ.get("DB_CONN", "sqlite://"))
+    args = parser.parse_args()
+
+    engine = create_engine(args.db)
+    db.metadata.create_all(engine)
+
+    print(f"Seeding {args.rows} quiz assignments...")
+    side, identifiers = seed(engine, args.rows)
+
+    table = QuizAssignment.__table__
+    indexes = {index.name: index for index in table.indexes}
+
+    benchmarks = {
+        "ix_quiz_assignment_quiz_assignment_identifier": [
+            select(table.c.id).where(table.c.quiz_assignment_identifier == identifier)
+            for identifier in random.sample(identifiers, LOOKUPS)
+        ],
+        "ix_quiz_assignment_quiz_id_assignee_id": [
+            select(table.c.id).where(
+                table.c.quiz_id == random.randint(1, side),
+                table.c.assignee_id == random.randint(1, side),
+            )
+            for _ in range(LOOKUPS)
+        ],
+    }
+
+    for name, statements in benchmarks.items():
+        indexed = time_lookups(engine, statements)
+
+        indexes[name].drop(engine)
+        # Sequential scans are slow, a handful of lookups is enough
+        sequential = time_lookups(engine, statements[:10])
+        indexes[name].create(engine)
+
+        print(
+            f"{name}: {indexed * 1000:.3f} ms with index, "
+            f"{sequential * 1000:.3f} ms without ({sequential / indexed:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Quiz read latency while a burst of logins is being served
+#
+# Runs the API on `--request-workers` threads, standing in for the uWSGI
+# workers, and sends them a mix of ProdUser logins and GET /quiz/{id}. Compares
+# hashing inline in the request worker with the bounded process pool, where
+# logins past its capacity are refused (429) instead of pinning workers
+#
+# Usage: python benchmarks/password_hashing.py [--logins 200] [--reads 2000]
+#                                              [--request-workers 8]
+#                                              [--hash-workers 2] [--hash-queue 2]
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+
+import statistics
+import argparse
+import tempfile
+import random
+import time
+import sys
+import os
+
+import connexion
+
+sys.path.append("src")
+
+from lib import passwords
+from model import db, ProdUser, Quiz
+
+
+def create_app(path: str):
+    app = connexion.FlaskApp(__name__, specification_dir="../src/api/")
+    app.add_api("openapi-spec.yml")
+    app = app.app
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+    return app
+
+
+def run(app, quiz_id: str, logins: int, reads: int, request_workers: int):
+    requests = ["login"] * logins + ["read"] * reads
+    random.Random(0).shuffle(requests)
+
+    def handle(kind: str):
+        start = time.perf_counter()
+
+        if kind == "read":
+            with app.test_client() as client:
+                assert client.get(f"/quiz/{quiz_id}").status_code == 200
+
+            return kind, "ok", time.perf_counter() - start
+
+        with app.app_context():
+            try:
+                assert ProdUser.login("alice@email.com", "password") is not None
+                outcome = "ok"
+            except passwords.PasswordHasherBusy:
+                outcome = "busy"
+
+        return kind, outcome, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=request_workers) as executor:
+        results = list(executor.map(handle, requests))
+    elapsed = time.perf_counter() - start
+
+    read_latencies = sorted(latency for kind, _, latency in results if kind == "read")
+    login_outcomes = [outcome for kind, outcome, _ in results if kind == "login"]
+
+    return {
+        "reads/s": reads / elapsed,
+        "read p50 ms": statistics.median(read_latencies) * 1000,
+        "read p99 ms": read_latencies[int(len(read_latencies) * 0.99) - 1] * 1000,
+        "logins ok": login_outcomes.count("ok"),
+        "logins 429": login_outcomes.count("busy"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--request-workers", type=int, default=8)
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--hash-queue", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(os.path.join(directory, "benchmark.db"))
+
+        with app.app_context():
+            quiz = Quiz.sample()
+            db.session.add(quiz)
+            db.session.commit()
+            quiz_id = quiz.quiz_identifier
+
+            ProdUser.register("alice@email.com", "password")
+
+        modes = {
+            # Every login hashes on the request worker that received it
+            "inline": passwords.PasswordHasher(
+                workers=0, queue_size=args.request_workers
+            ),
+            "pool": passwords.PasswordHasher(
+                workers=args.hash_workers, queue_size=args.hash_queue
+            ),
+        }
+
+        for name, hasher in modes.items():
+            passwords.get_password_hasher = lambda: hasher
+
+            result = run(app, quiz_id, args.logins, args.reads, args.request_workers)
+            hasher.shutdown()
+
+            print(
+                f"{name:<8} "
+                + "  ".join(
+                    f"{key} {value:.1f}" if isinstance(value, float) else f"{key} {value}"
+                    for key, value in result.items()
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
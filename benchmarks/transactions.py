@@ -0,0 +1,191 @@
+# Throughput of the transaction building paths of lib/script_tools.py and
+# lib/cardano_tools.py
+#
+# Runs against the offline MockChainContext, so no Blockfrost project or
+# network is needed and the numbers only reflect pycardano and our code.
+# Reports operations per second and the peak memory allocated by a single
+# operation, run it before and after upgrading pycardano
+#
+# Usage: python benchmarks/transactions.py [--iterations 200] [--policies 20]
+#                                          [--utxos 200]
+#                                          [--only fund_project,cbor_to_utxo]
+
+from __future__ import annotations
+from typing import Callable, Dict
+
+import argparse
+import tracemalloc
+import hashlib
+import logging
+import time
+import sys
+import os
+
+import cbor2
+import pycardano as pyc
+
+sys.path.append("src")
+
+from athena_providers.mock import MockChainContext
+from lib import cardano_tools, cardano_types, script_tools
+
+
+SCRIPT_PATH = "./script/script.plutus"
+
+# Signed "Pycardano is cool" with the payment key of this stake address
+SIGNATURE = "84584da301276761646472657373581d60a64aa1009d0f106fd742a79ee68bd9a5fd815ffa587d6d0aa68cb51e045820f84f04c0054dbbb0a7fcbd1584dac460cbd1b14723a6e9d2571477ba21644858a166686173686564f451507963617264616e6f20697320636f6f6c5840a3f2def0bc5cddbc5171226b45cf3cb37c55239e00f0abebc8aabc5242ea17f21130c928477ef66dca86327a8599b935ce3c9156ed15a5f1c328d04079bfff04"
+SIGNATURE_ADDRESS = "stake_test1uzny4ggqn583qm7hg2neae5tmxjlmq2llfv86mg256xt28sv20c2r"
+
+
+def signing_key(seed: str) -> pyc.PaymentSigningKey:
+    # Deterministic keys, so every run builds the same transactions
+    return pyc.PaymentSigningKey(hashlib.blake2b(seed.encode(), digest_size=32).digest())
+
+
+def key_address(key: pyc.PaymentSigningKey) -> pyc.Address:
+    return pyc.Address(
+        key.to_verification_key().hash(), network=pyc.Network.TESTNET
+    )
+
+
+def utxo_cbor(utxo: pyc.UTxO) -> str:
+    # Same format wallets send in funding_utxos
+    return cbor2.dumps(
+        [utxo.input.to_primitive(), utxo.output.to_primitive()]
+    ).hex()
+
+
+def cases(policies: int, utxos: int) -> Dict[str, Callable[[], object]]:
+    with open(SCRIPT_PATH, "r") as f:
+        script_hex = f.read()
+
+    compiled = script_tools.compile_script(script_hex)
+    script_address = compiled.address(pyc.Network.TESTNET)
+
+    chain_context = MockChainContext(lovelace=1_000_000_000_000)
+
+    funder = key_address(signing_key("funder"))
+    target = key_address(signing_key("target"))
+    mediator = key_address(signing_key("mediator"))
+    mediator_policy = signing_key("mediator_policy").to_verification_key().hash()
+
+    funder_utxos = chain_context.utxos(str(funder))
+    collateral = chain_context.utxos(str(target))[0]
+
+    datum = cardano_types.ContractDatum(
+        target=target.payment_part.to_primitive(),
+        mediators_nft=mediator_policy.to_primitive(),
+        deadline=1_700_000_000,
+    )
+    script_utxo = pyc.UTxO(
+        pyc.TransactionInput(
+            pyc.TransactionId(hashlib.blake2b(b"script", digest_size=32).digest()), 0
+        ),
+        pyc.TransactionOutput(
+            script_address, pyc.Value(10_000_000), datum_hash=pyc.datum_hash(datum)
+        ),
+    )
+    mediator_input = chain_context.utxos(str(mediator))[0].input
+
+    minter = signing_key("minter")
+    assets = [
+        (signing_key(f"policy_{i}"), {b"NFT": (None, 1)}) for i in range(policies)
+    ]
+
+    # A fragmented wallet, as sent to fund_project
+    encoded_utxos = [
+        utxo_cbor(utxo)
+        for utxo in MockChainContext(utxo_count=utxos).utxos(str(funder))
+    ]
+
+    # mint_nfts logs the whole transaction at debug level
+    logging.getLogger().setLevel(logging.WARNING)
+
+    return {
+        "fund_project": lambda: script_tools.create_transaction_fund_project(
+            chain_context,
+            funder,
+            funder_utxos[:2],
+            pyc.Value(10_000_000),
+            script_hex,
+            mediator_policy.to_primitive(),
+            target,
+            1_700_000_000,
+        ),
+        "fallback_project": lambda: script_tools.create_transaction_fallback_project(
+            chain_context,
+            collateral,
+            mediator,
+            mediator_input,
+            funder,
+            script_hex,
+            script_utxo,
+            datum,
+        ),
+        "target_project": lambda: script_tools.create_transaction_target_project(
+            chain_context,
+            target,
+            collateral,
+            script_hex,
+            script_utxo,
+            datum,
+        ),
+        f"cbor_to_utxo[{utxos} utxos]": lambda: [
+            script_tools.cbor_to_utxo(encoded) for encoded in encoded_utxos
+        ],
+        f"cbor_to_utxos[{utxos} utxos]": lambda: script_tools.cbor_to_utxos(
+            encoded_utxos
+        ),
+        f"mint_nfts[{policies} policies]": lambda: cardano_tools.mint_nfts(
+            chain_context, minter, assets
+        ),
+        "signature_message": lambda: cardano_tools.signature_message(
+            SIGNATURE, SIGNATURE_ADDRESS
+        ),
+    }
+
+
+def peak_allocation(operation: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(operation: Callable[[], object], iterations: int) -> float:
+    operation()  # Warm up caches (compiled script, imports)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--policies", type=int, default=20)
+    parser.add_argument("--utxos", type=int, default=200)
+    parser.add_argument("--only", help="comma separated benchmark names")
+    args = parser.parse_args()
+
+    os.environ.setdefault("NETWORK_MODE", "testnet")
+
+    only = set(args.only.split(",")) if args.only else None
+
+    print(f"{'benchmark':<28} {'ops/sec':>10} {'peak alloc/op':>14}")
+    for name, operation in cases(args.policies, args.utxos).items():
+        if only is not None and name.split("[")[0] not in only:
+            continue
+
+        ops = run(operation, args.iterations)
+        peak = peak_allocation(operation)
+
+        print(f"{name:<28} {ops:>10.1f} {peak / 1024:>11.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+CREATE TABLE answer_count (
+    quiz_id integer NOT NULL REFERENCES quiz (id),
+    question_index integer NOT NULL,
+    answer integer NOT NULL,
+    count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (quiz_id, question_index, answer)
+);
+
+INSERT INTO answer_count (quiz_id, question_index, answer, count)
+SELECT quiz_id, question_index, answer, COUNT(*)
+FROM attempt_answer
+GROUP BY quiz_id, question_index, answer;
+
+CREATE INDEX ix_attempt_answer_quiz_id_question_index
+ON attempt_answer (quiz_id, question_index);
@@ -0,0 +1,2 @@
+CREATE INDEX ix_funding_project_id_funder_id_status
+ON funding (project_id, funder_id, status);
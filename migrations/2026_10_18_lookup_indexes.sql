@@ -0,0 +1,20 @@
+CREATE UNIQUE INDEX ix_project_project_identifier
+ON project (project_identifier);
+
+CREATE UNIQUE INDEX ix_quiz_quiz_identifier
+ON quiz (quiz_identifier);
+
+CREATE UNIQUE INDEX ix_quiz_assignment_quiz_assignment_identifier
+ON quiz_assignment (quiz_assignment_identifier);
+
+CREATE UNIQUE INDEX ix_submission_submission_identifier
+ON submission (submission_identifier);
+
+CREATE UNIQUE INDEX ix_review_review_identifier
+ON review (review_identifier);
+
+CREATE INDEX ix_funding_funder_id_project_id_status
+ON funding (funder_id, project_id, status);
+
+CREATE INDEX ix_quiz_assignment_quiz_id_assignee_id
+ON quiz_assignment (quiz_id, assignee_id);
@@ -0,0 +1,9 @@
+DELETE FROM powerup
+WHERE id NOT IN (
+    SELECT MIN(id)
+    FROM powerup
+    GROUP BY quiz_assignment_id, name
+);
+
+ALTER TABLE powerup
+ADD CONSTRAINT uq_powerup_quiz_assignment_id_name UNIQUE (quiz_assignment_id, name);
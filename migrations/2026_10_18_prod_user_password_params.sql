@@ -0,0 +1,2 @@
+ALTER TABLE prod_user
+ADD COLUMN password_params varchar;
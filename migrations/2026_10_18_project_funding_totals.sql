@@ -0,0 +1,18 @@
+ALTER TABLE project
+ADD total_funding_amount bigint NOT NULL DEFAULT 0,
+ADD onchain_funding_amount bigint NOT NULL DEFAULT 0,
+ADD funder_count integer NOT NULL DEFAULT 0;
+
+UPDATE project
+SET total_funding_amount = totals.total_funding_amount,
+    onchain_funding_amount = totals.onchain_funding_amount,
+    funder_count = totals.funder_count
+FROM (
+    SELECT project_id,
+           COALESCE(SUM(CASE WHEN status = 'submitted' THEN amount ELSE 0 END), 0) AS total_funding_amount,
+           COALESCE(SUM(CASE WHEN status = 'onchain' THEN amount ELSE 0 END), 0) AS onchain_funding_amount,
+           COUNT(DISTINCT CASE WHEN status IN ('submitted', 'onchain') THEN funder_id END) AS funder_count
+    FROM funding
+    GROUP BY project_id
+) AS totals
+WHERE project.id = totals.project_id;
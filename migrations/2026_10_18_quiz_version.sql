@@ -0,0 +1,19 @@
+ALTER TABLE quiz
+ADD version integer NOT NULL DEFAULT 1;
+
+-- Bump the version on updates that don't, like raw SQL or other migrations,
+-- so cached quiz definitions of the old version are not read again. ORM
+-- updates already set version to the next one through version_id_col
+CREATE OR REPLACE FUNCTION quiz_bump_version() RETURNS trigger AS $$
+BEGIN
+    IF NEW.version = OLD.version THEN
+        NEW.version := OLD.version + 1;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER quiz_bump_version
+BEFORE UPDATE ON quiz
+FOR EACH ROW EXECUTE FUNCTION quiz_bump_version();
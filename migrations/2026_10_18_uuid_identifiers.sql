@@ -0,0 +1,16 @@
+-- Store public identifiers as native 16 byte uuids instead of strings.
+-- Existing values were generated with uuid4 so they cast directly
+ALTER TABLE project
+ALTER COLUMN project_identifier TYPE uuid USING project_identifier::uuid;
+
+ALTER TABLE quiz
+ALTER COLUMN quiz_identifier TYPE uuid USING quiz_identifier::uuid;
+
+ALTER TABLE quiz_assignment
+ALTER COLUMN quiz_assignment_identifier TYPE uuid USING quiz_assignment_identifier::uuid;
+
+ALTER TABLE submission
+ALTER COLUMN submission_identifier TYPE uuid USING submission_identifier::uuid;
+
+ALTER TABLE review
+ALTER COLUMN review_identifier TYPE uuid USING review_identifier::uuid;
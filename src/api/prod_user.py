@@ -1,4 +1,6 @@
 from model import db, ProdUser
+from lib.passwords import PasswordHasherBusy
+from lib import rate_limit
 
 from flask import request
 
@@ -9,7 +11,35 @@ def is_valid_email(email):
     return bool(re.match(email_regex, email))
 
 
+def too_many_requests(retry_after: int):
+    return (
+        {
+            "message": "Too many requests, try again later",
+            "code": "too-many-requests",
+        },
+        429,
+        {"Retry-After": str(retry_after)},
+    )
+
+
+def check_rate_limit(email: str):
+    # Before any hashing or database work, so a flood of attempts costs a
+    # dictionary lookup per request
+    retry_after = rate_limit.get_rate_limiter().retry_after(
+        ip=request.remote_addr or "unknown", account=email.lower()
+    )
+
+    if retry_after is not None:
+        return too_many_requests(retry_after)
+
+    return None
+
+
 def register(email: str):
+    limited = check_rate_limit(email)
+    if limited is not None:
+        return limited
+
     data = request.json
 
     existing_user: ProdUser | None = ProdUser.query.filter(
@@ -34,6 +64,36 @@ def register(email: str):
             "code": "email-not-valid",
         }, 400
     
-    user = ProdUser.register(email, data["password"])
+    try:
+        ProdUser.register(email, data["password"])
+    except PasswordHasherBusy:
+        return too_many_requests(1)
 
     return {}, 200
+
+
+def login(email: str):
+    limited = check_rate_limit(email)
+    if limited is not None:
+        return limited
+
+    data = request.json
+
+    try:
+        user: ProdUser | None = ProdUser.login(email, data["password"])
+    except PasswordHasherBusy:
+        return too_many_requests(1)
+
+    if user is None:
+        return {
+            "message": "Invalid email or password",
+            "code": "invalid-credentials",
+        }, 400
+
+    return {
+        "success": True,
+        "email": user.email,
+        "stake_address": user.stake_address,
+        "payment_address": user.payment_address,
+        "is_email_verified": user.is_email_verified,
+    }, 200
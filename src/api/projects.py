@@ -3,13 +3,26 @@ from sqlalchemy import and_, or_
 from typing import Union
 
 from model import Project, User, Subject, Submission, Deliverable, Funding, Review, db
-from lib import auth_tools
+from model.types import canonical_uuids
+from lib import auth_tools, pagination, response_cache
 
 
 import datetime
 import os
 
 
+# Fields of view=summary when no fields are given
+SUMMARY_FIELDS = [
+    "project_id",
+    "name",
+    "short_description",
+    "total_funding_amount",
+    "funder_count",
+    "mediator_count",
+    "submission_count",
+]
+
+
 def get_projects():
     data = request.args
 
@@ -17,10 +30,39 @@ def get_projects():
     count = 100 if not "count" in data else data["count"]
     page = 1 if not "page" in data else data["page"]
     order = "desc" if not "order" in data else data["order"]
+    mode = "offset" if not "pagination" in data else data["pagination"]
+    include_count = data.get("include_count", "false").lower() == "true"
 
     creator = data["creator"] if "creator" in data else None
     funder = data["funder"] if "funder" in data else None
 
+    # Summaries select their fields as columns, nothing else is loaded
+    summary = data.get("view") == "summary" or "fields" in data
+    summary_columns = Project.summary_columns()
+
+    fields = SUMMARY_FIELDS
+    if "fields" in data:
+        # Deduplicated, every field is a column label
+        fields = list(
+            dict.fromkeys(
+                field.strip() for field in data["fields"].split(",") if field.strip()
+            )
+        )
+
+        unknown = [field for field in fields if field not in summary_columns]
+        if unknown or not fields:
+            return {
+                "message": f"Unknown fields {', '.join(unknown)}, expected some of "
+                f"{', '.join(summary_columns)}",
+                "code": "invalid-fields",
+            }, 400
+
+    def parse(project) -> dict:
+        if summary:
+            return {field: getattr(project, field) for field in fields}
+
+        return project.parse()
+
     if creator is not None and funder is not None:
         query = Project.query.filter(
             or_(
@@ -37,6 +79,35 @@ def get_projects():
     else:
         query = Project.query
 
+    if summary:
+        # id and creation_date are needed for the pagination. Labeled, as
+        # project.id would otherwise be labeled project_id
+        query = query.with_entities(
+            Project.id.label("id"),
+            Project.creation_date.label("creation_date"),
+            *[summary_columns[field].label(field) for field in fields],
+        )
+    else:
+        query = query.options(*Project.eager_options())
+
+    if mode == "cursor":
+        try:
+            projects, next_cursor = pagination.keyset_page(
+                query, Project, int(count), data.get("cursor"), order
+            )
+        except ValueError:
+            return {"message": "Invalid cursor", "code": "invalid-cursor"}, 400
+
+        response = {
+            "projects": [parse(project) for project in projects],
+            "next_cursor": next_cursor,
+        }
+
+        if include_count:
+            response["count"] = query.order_by(None).count()
+
+        return response, 200
+
     if order == "asc":
         query = query.order_by(Project.creation_date.asc())
     else:
@@ -49,18 +120,25 @@ def get_projects():
     )
 
     return {
-        "count": projects.query.count(),
-        "projects": [project.parse() for project in projects.items],
+        "count": projects.total,
+        "projects": [parse(project) for project in projects.items],
     }, 200
 
 
 def create_project():
     data = request.json
 
-    if not "signature" in data:
+    authorization = request.headers.get("Authorization")
+
+    if not "signature" in data and authorization is None:
         return {"success": False, "message": f"Request body missing signature"}, 400
 
-    if auth_tools.user_can_signin(data["signature"], data["creator"]) is False:
+    if (
+        auth_tools.user_can_authenticate(
+            data.get("signature"), data["creator"], authorization
+        )
+        is False
+    ):
         return {"success": False, "message": f"Invalid signature"}, 400
 
     project = Project()
@@ -121,8 +199,14 @@ def create_project():
     return {"success": True}, 200
 
 
+@canonical_uuids("project_id")
+@response_cache.cached("project", "project_id")
 def get_project(project_id):
-    project = Project.query.filter(Project.project_identifier == project_id).first()
+    project = (
+        Project.query.options(*Project.eager_options())
+        .filter(Project.project_identifier == project_id)
+        .first()
+    )
 
     if project is None:
         return {"success": False, "code": "address-not-found"}, 404
@@ -133,6 +217,7 @@ def get_project(project_id):
     }, 200
 
 
+@canonical_uuids("project_id")
 def get_project_user(project_id, stake_address):
     project: Project = Project.query.filter(
         Project.project_identifier == project_id
@@ -164,6 +249,7 @@ def get_project_user(project_id, stake_address):
     }, 200
 
 
+@canonical_uuids("project_id")
 def submit_project(project_id):
     data = request.json
 
@@ -183,7 +269,11 @@ def submit_project(project_id):
         }, 400
 
     if (
-        auth_tools.user_can_signin(data["signature"], project.creator.stake_address)
+        auth_tools.user_can_authenticate(
+            data.get("signature"),
+            project.creator.stake_address,
+            request.headers.get("Authorization"),
+        )
         is False
     ):
         return {
@@ -203,9 +293,12 @@ def submit_project(project_id):
     db.session.add(project)
     db.session.commit()
 
+    response_cache.invalidate_project(project_id)
+
     return {"success": True}, 200
 
 
+@canonical_uuids("submission_id")
 def submit_review(submission_id):
     data = request.json
 
@@ -217,7 +310,12 @@ def submit_review(submission_id):
             "message": f"User with stake address {data['reviewer']} not found",
         }, 404
 
-    if auth_tools.user_can_signin(data["signature"], data["reviewer"]) is False:
+    if (
+        auth_tools.user_can_authenticate(
+            data.get("signature"), data["reviewer"], request.headers.get("Authorization")
+        )
+        is False
+    ):
         return {
             "success": False,
             "code": "invalid_signature",
@@ -267,9 +365,13 @@ def submit_review(submission_id):
     db.session.add(submission)
     db.session.commit()
 
+    response_cache.invalidate_project(submission.project.project_identifier)
+
     return {"success": True}, 200
 
 
+@canonical_uuids("project_id")
+@response_cache.cached("submissions", "project_id")
 def get_submissions(project_id):
     project = Project.query.filter(Project.project_identifier == project_id).first()
     if project is None:
@@ -320,9 +422,12 @@ def add_mediator_to_all_projects():
 
     db.session.commit()
 
+    response_cache.invalidate_project()
+
     return {"success": True}, 200
 
 
+@canonical_uuids("project_id")
 def add_mediator(project_id):
     data = request.json
 
@@ -362,4 +467,6 @@ def add_mediator(project_id):
     db.session.add(project)
     db.session.commit()
 
+    response_cache.invalidate_project(project_id)
+
     return {"success": True}, 200
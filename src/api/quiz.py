@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from model import AttemptAnswer, Quiz, QuizAssignment, User, PowerUp, db
-from lib import auth_tools
+from model.powerup import POWERUP_NAMES
+from model.types import canonical_uuid, canonical_uuids
+from lib import auth_tools, quiz_import, response_cache
 from flask import request
 
+import io
+
 
 def create_quiz():
     data = request.json
@@ -28,6 +32,16 @@ def create_quiz():
     return {"success": True, "quiz_id": quiz.quiz_identifier}, 200
 
 
+def import_quizzes(format: str = "jsonl"):
+    # The body was already buffered by connexion, parse it line by line from
+    # there instead of decoding it into a single document
+    stream = io.StringIO(request.get_data(as_text=True), newline="")
+
+    report = quiz_import.import_quizzes(quiz_import.READERS[format](stream))
+
+    return {"success": len(report["errors"]) == 0, **report}, 200
+
+
 def assign_quiz():
     data = request.json
 
@@ -39,6 +53,70 @@ def assign_quiz():
     return quiz_assignment.info()
 
 
+def bulk_assign_quiz():
+    data = request.json
+
+    results = QuizAssignment.bulk_find_or_create(
+        [
+            (canonical_uuid(assignment["quiz_id"]), assignment["user_stake_address"])
+            for assignment in data["assignments"]
+        ]
+    )
+
+    return {"results": results}, 200
+
+
+def bulk_create_powerup():
+    data = request.json
+
+    if "quiz_assignment_ids" not in data and "quiz_id" not in data:
+        return {
+            "message": "Either quiz_assignment_ids or quiz_id is required",
+            "code": "missing-quiz-assignment-filter",
+        }, 400
+
+    unknown = [name for name in data["powerups"] if name not in POWERUP_NAMES]
+    if unknown:
+        return {
+            "message": f"Unknown powerups {', '.join(unknown)}, expected some of "
+            f"{', '.join(POWERUP_NAMES)}",
+            "code": "unknown-powerup",
+        }, 400
+
+    # Same rule as create_powerup, only assignments in progress get powerups
+    query = QuizAssignment.query.filter(
+        QuizAssignment.completed_success.is_(None),
+        QuizAssignment.current_question.isnot(None),
+        QuizAssignment.completed_date.is_(None),
+    )
+
+    if "quiz_assignment_ids" in data:
+        query = query.filter(
+            QuizAssignment.quiz_assignment_identifier.in_(data["quiz_assignment_ids"])
+        )
+
+    if "quiz_id" in data:
+        query = query.join(QuizAssignment.quiz).filter(
+            Quiz.quiz_identifier == data["quiz_id"]
+        )
+
+    quiz_assignments = query.with_entities(
+        QuizAssignment.id, QuizAssignment.quiz_assignment_identifier
+    ).all()
+
+    created = PowerUp.bulk_create([id for id, _ in quiz_assignments], data["powerups"])
+
+    return {
+        "success": True,
+        "created": created,
+        "quiz_assignment_ids": [identifier for _, identifier in quiz_assignments],
+    }, 200
+
+
+# current_limit is changed outside the API, the version the ORM and the
+# quiz_bump_version trigger bump on every update is part of the key
+@canonical_uuids("quiz_id")
+@response_cache.cached("quiz", "quiz_id", version=Quiz.current_version)
 def get_quiz(quiz_id: str):
     quiz: Quiz | None = Quiz.find(quiz_id)
     if quiz is None:
@@ -47,6 +125,7 @@ def get_quiz(quiz_id: str):
     return quiz.public_info(), 200
 
 
+@canonical_uuids("quiz_assignment_id")
 def get_assignment(quiz_assignment_id: str):
     quiz_assignment: QuizAssignment = QuizAssignment.query.filter(
         QuizAssignment.quiz_assignment_identifier == quiz_assignment_id
@@ -61,11 +140,12 @@ def get_assignment(quiz_assignment_id: str):
     return quiz_assignment.info(), 200
 
 
+@canonical_uuids("quiz_assignment_id")
 def attempt_answer(quiz_assignment_id: str):
     data = request.json
 
     answer = data["answer"]
-    signature = data["signature"]
+    signature = data.get("signature")
 
     quiz_assignment: QuizAssignment = QuizAssignment.query.filter(
         QuizAssignment.quiz_assignment_identifier == quiz_assignment_id
@@ -77,23 +157,42 @@ def attempt_answer(quiz_assignment_id: str):
             "code": "quiz-assignment-not-found",
         }, 404
 
-    if not auth_tools.validate_signature(
-        signature, quiz_assignment.assignee.stake_address
+    if not auth_tools.authenticate(
+        signature,
+        quiz_assignment.assignee.stake_address,
+        request.headers.get("Authorization"),
     ):
         return {
             "success": False,
             "message": "Invalid signature",
             "code": "invalid-signature",
         }, 400
-    
+
+    # Lock the assignment row and reload its state so concurrent attempts
+    # are applied one after the other. The lock is held until the single
+    # commit below
+    db.session.refresh(quiz_assignment, with_for_update=True)
+
+    if not quiz_assignment.in_progress():
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "message": f"Quiz Assignment {quiz_assignment.quiz_assignment_identifier} is not in progress",
+            "code": "quiz-assignment-completed",
+        }, 400
+
     if quiz_assignment.current_question > quiz_assignment.quiz.current_limit:
+        db.session.rollback()
+
         return {
             "success": False,
             "message": "Quiz question is above current limitis not active",
             "code": "quiz-question-not-active",
         }, 400
 
-    current_question = quiz_assignment.quiz.questions[quiz_assignment.current_question]
+    questions = quiz_assignment.quiz.definition().questions
+    current_question = questions[quiz_assignment.current_question]
 
     AttemptAnswer.attempt(
         quiz_assignment.quiz,
@@ -110,7 +209,7 @@ def attempt_answer(quiz_assignment_id: str):
             "remaining_attempts": quiz_assignment.remaining_attempts,
         }
 
-        if quiz_assignment.current_question == len(quiz_assignment.quiz.questions) - 1:
+        if quiz_assignment.current_question == len(questions) - 1:
             # If this was the last question
 
             quiz_assignment.complete_with_success()
@@ -120,8 +219,6 @@ def attempt_answer(quiz_assignment_id: str):
 
             response["state"] = "ongoing"
             response["current_question"] = quiz_assignment.current_question
-
-        return response, 200
     else:
         # Wrong answer scenario
 
@@ -141,13 +238,16 @@ def attempt_answer(quiz_assignment_id: str):
             response["state"] = "ongoing"
             response["current_question"] = quiz_assignment.current_question
 
-        return response, 200
+    db.session.commit()
+
+    return response, 200
 
 
+@canonical_uuids("quiz_assignment_id")
 def activate_powerup(quiz_assignment_id: str, powerup: str):
     data = request.json
 
-    signature = data["signature"]
+    signature = data.get("signature")
 
     quiz_assignment: QuizAssignment = QuizAssignment.query.filter(
         (QuizAssignment.quiz_assignment_identifier == quiz_assignment_id)
@@ -166,8 +266,10 @@ def activate_powerup(quiz_assignment_id: str, powerup: str):
             "code": "quiz-question-not-active",
         }, 400
 
-    if not auth_tools.validate_signature(
-        signature, quiz_assignment.assignee.stake_address
+    if not auth_tools.authenticate(
+        signature,
+        quiz_assignment.assignee.stake_address,
+        request.headers.get("Authorization"),
     ):
         return {
             "success": False,
@@ -214,6 +316,7 @@ def activate_powerup(quiz_assignment_id: str, powerup: str):
     }, 200
 
 
+@canonical_uuids("quiz_assignment_id")
 def create_powerup(quiz_assignment_id: str, powerup: str):
     data = request.json
 
@@ -1,8 +1,8 @@
 from typing import List
-from flask import request
+from flask import current_app, request
 from sqlalchemy import and_
 
-from lib import script_tools, auth_tools
+from lib import script_tools, auth_tools, jobs, response_cache
 from model import Project, User, Funding, db
 
 import pycardano as pyc
@@ -12,7 +12,82 @@ import os
 SECONDS_FOR_DAY = 86_400
 
 
-def fund_project():
+def build_fund_project(
+    funder: User, project: Project, funding_utxos: List[pyc.UTxO], funding_amount: int
+) -> dict:
+    # Builds the funding transaction and records the funding. This is the slow
+    # part of fund_project, as the chain context is queried for the protocol
+    # parameters and the script UTxOs
+    cardano_handler = script_tools.get_cardano_handler()
+
+    # Funding policy ID concated with asset name
+    funding_asset = os.environ.get("FUNDING_ASSET")
+    funding_policy_id, funding_asset_name = funding_asset[:56], funding_asset[56:]
+
+    funding_value = pyc.Value.from_primitive(
+        [
+            2_000_000,
+            {
+                bytes.fromhex(funding_policy_id): {
+                    bytes.fromhex(funding_asset_name): funding_amount
+                }
+            },
+        ]
+    )
+
+    transaction = script_tools.create_transaction_fund_project(
+        cardano_handler["chain_context"],
+        pyc.Address.from_primitive(funder.payment_address),
+        funding_utxos,
+        funding_value,
+        cardano_handler["script"],
+        bytes.fromhex(cardano_handler["mediator_policy"]),
+        pyc.Address.from_primitive(project.creator.payment_address),
+        project.creation_date.timestamp() + project.days_to_complete * SECONDS_FOR_DAY,
+    )
+
+    project.lock()
+
+    funding = Funding(
+        funder=funder,
+        project=project,
+        transaction_hash=str(transaction.transaction_body.id),
+        transaction_index=0,
+        amount=funding_amount,
+    )
+
+    db.session.add(funding)
+    project.apply_funding(funding)
+    db.session.commit()
+
+    response_cache.invalidate_project(project.project_identifier)
+
+    # Sender will need to have the identifier NFT in this case
+    return {
+        "transaction_cbor": transaction.transaction_body.to_cbor(),
+        "witness_cbor": transaction.transaction_witness_set.to_cbor(),
+    }
+
+
+def build_fund_project_job(
+    app,
+    funder_id: int,
+    project_id: int,
+    funding_utxos: List[pyc.UTxO],
+    funding_amount: int,
+) -> dict:
+    # Runs on a job worker thread, so it needs its own app context and has
+    # to load the rows again in its own session
+    with app.app_context():
+        return build_fund_project(
+            User.query.get(funder_id),
+            Project.query.get(project_id),
+            funding_utxos,
+            funding_amount,
+        )
+
+
+def fund_project(mode: str = "sync"):
     # Initialise Cardano needs to give us
     # * Chain Context
     # * Script Hex
@@ -47,18 +122,28 @@ def fund_project():
     data = request.json
 
     stake_address = data["stake_address"]
-    funding_utxos = data["funding_utxos"]
     funding_amount = data["funding_amount"]
     project_id = data["project_id"]
-    signature = data["signature"]
+    signature = data.get("signature")
 
-    if not auth_tools.validate_signature(signature, stake_address):
+    if not auth_tools.authenticate(
+        signature, stake_address, request.headers.get("Authorization")
+    ):
         return {
             "success": False,
             "message": "Invalid signature",
             "code": "invalid-signature",
         }, 400
 
+    try:
+        funding_utxos = script_tools.cbor_to_utxos(data["funding_utxos"])
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": str(e),
+            "code": "invalid-funding-utxos",
+        }, 400
+
     project: Project = Project.query.filter(
         and_(Project.project_identifier == project_id, Project.status == "open")
     ).first()
@@ -76,50 +161,32 @@ def fund_project():
             "code": "address-not-found",
         }, 404
 
-    cardano_handler = script_tools.initialise_cardano()
+    if mode == "job":
+        # Only the checks above run in the request, the transaction is built
+        # by a job worker and polled for with get_transaction_job
+        job_id = jobs.get_job_queue().submit(
+            build_fund_project_job,
+            current_app._get_current_object(),
+            funder.id,
+            project.id,
+            funding_utxos,
+            funding_amount,
+        )
 
-    # Funding policy ID concated with asset name
-    funding_asset = os.environ.get("FUNDING_ASSET")
-    funding_policy_id, funding_asset_name = funding_asset[:56], funding_asset[56:]
+        return {"job_id": job_id, "status": "pending"}, 202
 
-    funding_value = pyc.Value.from_primitive(
-        [
-            2_000_000,
-            {
-                bytes.fromhex(funding_policy_id): {
-                    bytes.fromhex(funding_asset_name): funding_amount
-                }
-            },
-        ]
-    )
+    return build_fund_project(funder, project, funding_utxos, funding_amount), 200
 
-    transaction = script_tools.create_transaction_fund_project(
-        cardano_handler["chain_context"],
-        pyc.Address.from_primitive(funder.payment_address),
-        [script_tools.cbor_to_utxo(utxo) for utxo in funding_utxos],
-        funding_value,
-        cardano_handler["script"],
-        bytes.fromhex(cardano_handler["mediator_policy"]),
-        pyc.Address.from_primitive(project.creator.payment_address),
-        project.creation_date.timestamp() + project.days_to_complete * SECONDS_FOR_DAY,
-    )
-
-    funding = Funding(
-        funder=funder,
-        project=project,
-        transaction_hash=str(transaction.transaction_body.id),
-        transaction_index=0,
-        amount=funding_amount,
-    )
 
-    db.session.add(funding)
-    db.session.commit()
+def get_transaction_job(job_id: str):
+    job = jobs.get_job_queue().get(job_id)
+    if job is None:
+        return {
+            "message": f"No transaction job found with ID {job_id}",
+            "code": "job-not-found",
+        }, 404
 
-    # Sender will need to have the identifier NFT in this case
-    return {
-        "transaction_cbor": transaction.transaction_body.to_cbor(),
-        "witness_cbor": transaction.transaction_witness_set.to_cbor(),
-    }, 200
+    return job, 200
 
 
 def fund_project_submitted():
@@ -129,7 +196,7 @@ def fund_project_submitted():
     transaction_hash = data["transaction_hash"]
     funding_amount = data["funding_amount"]
     project_id = data["project_id"]
-    signature = data["signature"]
+    signature = data.get("signature")
 
     # Make sure address exists
     funder: User = User.query.filter(User.stake_address == stake_address).first()
@@ -139,7 +206,9 @@ def fund_project_submitted():
             "code": "address-not-found",
         }, 404
     
-    if not auth_tools.validate_signature(signature, stake_address):
+    if not auth_tools.authenticate(
+        signature, stake_address, request.headers.get("Authorization")
+    ):
         return {
             "message": "Invalid signature",
             "code": "invalid-signature",
@@ -155,6 +224,8 @@ def fund_project_submitted():
             "code": "project-not-found",
         }, 404
 
+    project.lock()
+
     funding = Funding(
         funder=funder,
         project=project,
@@ -165,6 +236,9 @@ def fund_project_submitted():
     )
 
     db.session.add(funding)
+    project.apply_funding(funding)
     db.session.commit()
 
+    response_cache.invalidate_project(project.project_identifier)
+
     return {"message": "Everything went well"}, 200
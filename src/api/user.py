@@ -3,11 +3,12 @@ from __future__ import annotations
 from flask import request
 from sqlalchemy import and_, func
 
-from lib import cardano_tools, auth_tools
+from lib import cardano_tools, auth_tools, pagination, response_cache
 from model import User, Quiz, QuizAssignment, db
 
 import datetime
 import logging
+import time
 
 
 def register(stake_address: str):
@@ -44,6 +45,33 @@ def register(stake_address: str):
     return {"success": True}, 200
 
 
+def create_session(stake_address: str):
+    data = request.json
+
+    if not auth_tools.sessions_enabled():
+        return {
+            "success": False,
+            "message": "Session tokens are not enabled on this server",
+            "code": "sessions-disabled",
+        }, 503
+
+    if not auth_tools.user_can_signin(data["signature"], stake_address):
+        return {
+            "success": False,
+            "message": "Invalid signature",
+            "code": "invalid-signature",
+        }, 400
+
+    expires_at = int(time.time()) + auth_tools.SESSION_EXPIRE_SECONDS
+
+    return {
+        "success": True,
+        "token": auth_tools.issue_session_token(stake_address, expires_at),
+        "expires_at": expires_at,
+    }, 200
+
+
+@response_cache.cached("user", "stake_address")
 def get_info(stake_address: str):
     user: User | None = User.query.filter(User.stake_address == stake_address).first()
 
@@ -100,20 +128,53 @@ def get_quiz_info(stake_address: str):
 def get_users():
     data = request.args
 
-    users = (
+    query = (
         User.query.add_columns(
             User.email,
             User.payment_address,
             User.stake_address,
+            User.creation_date,
+            User.id,
             func.count(User.created_projects).label("project_count"),
         )
         .outerjoin(User.created_projects, isouter=True)
         .group_by(User.id)
-        .paginate(
-            int(data["page"]) if "page" in data else 0,
-            int(data["count"]) if "count" in data else 20,
-            False,
-        )
+    )
+
+    if data.get("pagination") == "cursor":
+        try:
+            users, next_cursor = pagination.keyset_page(
+                query,
+                User,
+                int(data["count"]) if "count" in data else 20,
+                data.get("cursor"),
+                data.get("order", "desc"),
+            )
+        except ValueError:
+            return {"message": "Invalid cursor", "code": "invalid-cursor"}, 400
+
+        response = {
+            "users": [
+                {
+                    "email": user.email,
+                    "stake_address": user.stake_address,
+                    "payment_address": user.payment_address,
+                    "project_count": user.project_count,
+                }
+                for user in users
+            ],
+            "next_cursor": next_cursor,
+        }
+
+        if data.get("include_count", "false").lower() == "true":
+            response["total"] = User.query.count()
+
+        return response, 200
+
+    users = query.paginate(
+        int(data["page"]) if "page" in data else 0,
+        int(data["count"]) if "count" in data else 20,
+        False,
     )
 
     return {
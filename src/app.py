@@ -1,4 +1,6 @@
 import os
+import json
+import click
 import connexion
 import logging
 
@@ -7,6 +9,7 @@ from dotenv import load_dotenv
 from flask_cors import CORS
 from flask_migrate import Migrate
 from model import Deliverable, Project, Subject, User, db
+from lib import auth_tools, json_provider, quiz_import
 
 load_dotenv()
 
@@ -17,11 +20,14 @@ DB_CONN = os.environ.get('DB_CONN')
 logging.basicConfig(level=LOGLEVEL,
                     format='%(asctime)s %(levelname)s %(message)s')
 
+auth_tools.check_session_secret()
+
 cors = CORS(supports_credentials=True)
 
 options = {"swagger_ui": True}
 conn = connexion.App(__name__, specification_dir='./api', options=options)
 conn.add_api('openapi-spec.yml')
+json_provider.install()
 app = conn.app
 
 app.config['SQLALCHEMY_DATABASE_URI'] = DB_CONN
@@ -37,6 +43,24 @@ with app.app_context():
 
 cors.init_app(app)
 
+
+@app.cli.command("import-quizzes")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", type=click.Choice(list(quiz_import.READERS)), default="jsonl")
+@click.option("--batch-size", type=int, default=quiz_import.BATCH_SIZE)
+def import_quizzes(path, format, batch_size):
+    """Imports the quizzes of a JSON lines or CSV file, streaming it from disk"""
+
+    with open(path, newline="") as file:
+        report = quiz_import.import_quizzes(
+            quiz_import.READERS[format](file), batch_size=batch_size
+        )
+
+    for error in report["errors"]:
+        click.echo(f"Row {error['row']}: {'; '.join(error['errors'])}", err=True)
+
+    click.echo(json.dumps({"imported": report["imported"], "errors": len(report["errors"])}))
+
 application = app
 
 if __name__ == '__main__':
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import Callable, Dict, List
+
+from lib.config import load_config
+
+import pycardano as pyc
+
+
+DEFAULT_PROVIDER = "blockfrost"
+
+
+class Provider:
+    # A way of building the ChainContext. `envs` are the env variables it
+    # needs on top of the common ones read by script_tools
+
+    def __init__(
+        self,
+        envs: List[str],
+        create: Callable[[Dict[str, str], pyc.Network], pyc.ChainContext],
+    ):
+        self.envs = envs
+        self.create = create
+
+
+providers: Dict[str, Provider] = {}
+
+
+def register(name: str, envs: List[str]):
+    def decorator(create):
+        providers[name] = Provider(envs, create)
+
+        return create
+
+    return decorator
+
+
+def provider_name() -> str:
+    # Provider selected by the "athena_provider" key of config.json
+    try:
+        return load_config().get("athena_provider", DEFAULT_PROVIDER)
+    except FileNotFoundError:
+        return DEFAULT_PROVIDER
+
+
+def get_provider(name: str) -> Provider:
+    if name not in providers:
+        raise ValueError(
+            f"Unknown athena_provider {name}, expected one of {', '.join(providers)}"
+        )
+
+    return providers[name]
+
+
+from . import blockfrost, ogmios, mock  # noqa: E402,F401
@@ -0,0 +1,14 @@
+from typing import Dict
+
+from . import register
+
+import pycardano as pyc
+
+
+@register("blockfrost", ["BLOCKFROST_PROJECT_ID", "BLOCKFROST_BASE_URL"])
+def create_chain_context(envs: Dict[str, str], network: pyc.Network):
+    return pyc.BlockFrostChainContext(
+        project_id=envs["BLOCKFROST_PROJECT_ID"],
+        base_url=envs["BLOCKFROST_BASE_URL"],
+        network=network,
+    )
@@ -1,5 +1,186 @@
-def create_project(_):
-    return {
-        "tx_hash": "<hash>",
-        "tx_cbor": "<cbor>"
-    }
\ No newline at end of file
+from __future__ import annotations
+from typing import Dict, List, Union
+
+from . import register
+
+import pycardano as pyc
+import threading
+import hashlib
+import cbor2
+import io
+
+
+PROTOCOL_PARAMETERS = pyc.ProtocolParameters(
+    min_fee_constant=155381,
+    min_fee_coefficient=44,
+    max_block_size=90112,
+    max_tx_size=16384,
+    max_block_header_size=1100,
+    key_deposit=2000000,
+    pool_deposit=500000000,
+    pool_influence=0.3,
+    monetary_expansion=0.003,
+    treasury_expansion=0.2,
+    decentralization_param=0,
+    extra_entropy="",
+    protocol_major_version=8,
+    protocol_minor_version=0,
+    min_utxo=1000000,
+    min_pool_cost=340000000,
+    price_mem=0.0577,
+    price_step=0.0000721,
+    max_tx_ex_mem=14000000,
+    max_tx_ex_steps=10000000000,
+    max_block_ex_mem=62000000,
+    max_block_ex_steps=20000000000,
+    max_val_size=5000,
+    collateral_percent=150,
+    max_collateral_inputs=3,
+    coins_per_utxo_word=4310,
+    coins_per_utxo_byte=4310,
+    cost_models={},
+)
+
+GENESIS_PARAMETERS = pyc.GenesisParameters(
+    active_slots_coefficient=0.05,
+    update_quorum=5,
+    max_lovelace_supply=45000000000000000,
+    network_magic=1,
+    epoch_length=432000,
+    system_start=1654041600,
+    slots_per_kes_period=129600,
+    slot_length=1,
+    max_kes_evolutions=62,
+    security_param=2160,
+)
+
+# Units reported for every redeemer, well under the transaction limits
+EXECUTION_UNITS = (1_000_000, 500_000_000)
+
+
+def transaction_id(cbor: bytes) -> pyc.TransactionId:
+    # Hash of the body exactly as it was serialized. pycardano may encode a
+    # decoded body differently (e.g. legacy outputs), which changes its id
+    stream = io.BytesIO(cbor)
+    stream.read(1)  # Transaction array header
+    cbor2.CBORDecoder(stream).decode()
+
+    return pyc.TransactionId(
+        hashlib.blake2b(cbor[1 : stream.tell()], digest_size=32).digest()
+    )
+
+
+class MockChainContext(pyc.ChainContext):
+    # Offline chain context with fixed parameters. Every address starts with
+    # `utxo_count` UTxOs of `lovelace` whose ids only depend on the address,
+    # and submitted transactions spend and create UTxOs in memory, so runs
+    # are reproducible and need no network
+
+    def __init__(
+        self,
+        network: pyc.Network = pyc.Network.TESTNET,
+        utxo_count: int = 5,
+        lovelace: int = 100_000_000,
+        last_block_slot: int = 30_000_000,
+    ):
+        self._network = network
+        self._last_block_slot = last_block_slot
+        self.utxo_count = utxo_count
+        self.lovelace = lovelace
+
+        self._utxos: Dict[str, List[pyc.UTxO]] = {}
+        self._lock = threading.Lock()
+        self.submitted: List[pyc.Transaction] = []
+
+    @property
+    def protocol_param(self) -> pyc.ProtocolParameters:
+        return PROTOCOL_PARAMETERS
+
+    @property
+    def genesis_param(self) -> pyc.GenesisParameters:
+        return GENESIS_PARAMETERS
+
+    @property
+    def network(self) -> pyc.Network:
+        return self._network
+
+    @property
+    def epoch(self) -> int:
+        return self._last_block_slot // GENESIS_PARAMETERS.epoch_length
+
+    @property
+    def last_block_slot(self) -> int:
+        return self._last_block_slot
+
+    def initial_utxos(self, address: str) -> List[pyc.UTxO]:
+        return [
+            pyc.UTxO(
+                pyc.TransactionInput(
+                    pyc.TransactionId(
+                        hashlib.blake2b(
+                            f"{address}#{i}".encode("utf-8"), digest_size=32
+                        ).digest()
+                    ),
+                    0,
+                ),
+                pyc.TransactionOutput(
+                    pyc.Address.from_primitive(address), pyc.Value(self.lovelace)
+                ),
+            )
+            for i in range(self.utxo_count)
+        ]
+
+    def utxos(self, address: str) -> List[pyc.UTxO]:
+        address = str(address)
+
+        with self._lock:
+            if address not in self._utxos:
+                self._utxos[address] = self.initial_utxos(address)
+
+            return list(self._utxos[address])
+
+    def add_utxo(self, utxo: pyc.UTxO):
+        address = str(utxo.output.address)
+
+        # An address seeded before being queried only has the seeded UTxOs
+        with self._lock:
+            self._utxos.setdefault(address, []).append(utxo)
+
+    def submit_tx(self, cbor: Union[bytes, str]) -> str:
+        if isinstance(cbor, str):
+            cbor = bytes.fromhex(cbor)
+
+        transaction = pyc.Transaction.from_cbor(cbor)
+        body = transaction.transaction_body
+        id = transaction_id(cbor)
+        spent = set(body.inputs)
+
+        with self._lock:
+            for address, utxos in self._utxos.items():
+                self._utxos[address] = [
+                    utxo for utxo in utxos if utxo.input not in spent
+                ]
+
+            for i, output in enumerate(body.outputs):
+                self._utxos.setdefault(str(output.address), []).append(
+                    pyc.UTxO(pyc.TransactionInput(id, i), output)
+                )
+
+            self.submitted.append(transaction)
+
+        return str(id)
+
+    def evaluate_tx(self, cbor: Union[bytes, str]) -> Dict[str, pyc.ExecutionUnits]:
+        transaction = pyc.Transaction.from_cbor(cbor)
+
+        return {
+            f"{redeemer.tag.name.lower()}:{redeemer.index}": pyc.ExecutionUnits(
+                *EXECUTION_UNITS
+            )
+            for redeemer in transaction.transaction_witness_set.redeemer or []
+        }
+
+
+@register("mock", [])
+def create_chain_context(envs: Dict[str, str], network: pyc.Network):
+    return MockChainContext(network=network)
@@ -0,0 +1,16 @@
+from typing import Dict
+
+from . import register
+
+import pycardano as pyc
+
+
+@register("ogmios", ["OGMIOS_URL", "KUPO_URL"])
+def create_chain_context(envs: Dict[str, str], network: pyc.Network):
+    # Ogmios for the protocol parameters and submission, Kupo indexes the
+    # UTxOs by address
+    return pyc.OgmiosChainContext(
+        ws_url=envs["OGMIOS_URL"],
+        network=network,
+        kupo_url=envs["KUPO_URL"],
+    )
@@ -1,15 +1,50 @@
 import datetime
+import hashlib
 import logging
+import base64
+import hmac
+import json
+import time
+import os
 
 from lib import cardano_tools
+from lib.cache import TTLCache, MISSING
 from model import User
 
 
 EXPIRE_SECONDS = 24 * 60 * 60
 
+# Verified messages by (signature digest, address). Clients reuse the same
+# signed message until it expires, so this skips COSE verification for
+# every request after the first one
+signature_cache = TTLCache(max_size=10_000, ttl=EXPIRE_SECONDS)
+
+SESSION_EXPIRE_SECONDS = 60 * 60
+
+# Session tokens are HMAC-SHA256, shorter secrets can be brute forced
+MIN_SESSION_SECRET_LENGTH = 32
+
+
+def signature_digest(signature) -> str:
+    if isinstance(signature, dict):
+        signature = json.dumps(signature, sort_keys=True)
+
+    return hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+
+def signature_message(signature, address):
+    key = (signature_digest(signature), address)
+
+    validation = signature_cache.get(key)
+    if validation is MISSING:
+        validation = cardano_tools.signature_message(signature, address)
+        signature_cache.set(key, validation)
+
+    return validation
+
 
 def validate_signature(signature, address):
-    validation = cardano_tools.signature_message(signature, address)
+    validation = signature_message(signature, address)
     if validation is None:
         logging.warning(
             "Validation failed - Either address is incorrect or signature is invalid")
@@ -45,3 +80,118 @@ def user_can_signin(signature, address):
         return False
 
     return True
+
+
+def session_secret() -> bytes:
+    # Raises ValueError if SESSION_SECRET is missing or too short to sign
+    # tokens with. Session tokens are optional, without a secret they are
+    # neither issued nor accepted
+    secret = os.environ.get("SESSION_SECRET")
+    if secret is None:
+        raise ValueError("SESSION_SECRET not set")
+
+    if len(secret) < MIN_SESSION_SECRET_LENGTH:
+        raise ValueError(
+            f"SESSION_SECRET must be at least {MIN_SESSION_SECRET_LENGTH} characters long"
+        )
+
+    return secret.encode("utf-8")
+
+
+def sessions_enabled() -> bool:
+    try:
+        session_secret()
+    except ValueError:
+        return False
+
+    return True
+
+
+def check_session_secret():
+    # Warns at startup instead of on the first request using sessions
+    try:
+        session_secret()
+    except ValueError as e:
+        logging.warning(f"Session tokens are disabled: {e}")
+
+
+def session_token_mac(payload: bytes) -> bytes:
+    return hmac.new(session_secret(), payload, hashlib.sha256).digest()
+
+
+def issue_session_token(address: str, expires_at: int = None) -> str:
+    # Stateless token binding an address to an expiration date, signed with
+    # SESSION_SECRET so it can be checked without verifying a signature again
+    if expires_at is None:
+        expires_at = int(time.time()) + SESSION_EXPIRE_SECONDS
+
+    payload = f"{address}|{expires_at}".encode("utf-8")
+
+    return ".".join(
+        base64.urlsafe_b64encode(part).decode("utf-8")
+        for part in (payload, session_token_mac(payload))
+    )
+
+
+def validate_session_token(token: str, address: str):
+    try:
+        payload, mac = [
+            base64.urlsafe_b64decode(part.encode("utf-8")) for part in token.split(".")
+        ]
+        token_address, expires_at = payload.decode("utf-8").rsplit("|", 1)
+        expires_at = int(expires_at)
+    except ValueError:
+        logging.warning("Session token is formatted incorrectly")
+        return False
+
+    if not sessions_enabled():
+        logging.warning("Session token given but session tokens are disabled")
+        return False
+
+    if not hmac.compare_digest(mac, session_token_mac(payload)):
+        logging.warning("Session token has an invalid signature")
+        return False
+
+    if token_address != address:
+        logging.warning("Session token was issued to a different address")
+        return False
+
+    if time.time() > expires_at:
+        logging.warning("Session token has expired")
+        return False
+
+    return True
+
+
+def session_token_from_header(authorization: str = None):
+    if authorization is None or not authorization.startswith("Bearer "):
+        return None
+
+    return authorization[len("Bearer "):]
+
+
+def authenticate(signature, address, authorization: str = None):
+    # Accepts either a session token in the Authorization header or a signature
+    token = session_token_from_header(authorization)
+    if token is not None:
+        return validate_session_token(token, address)
+
+    if signature is None:
+        logging.warning("Neither signature nor session token given")
+        return False
+
+    return validate_signature(signature, address)
+
+
+def user_can_authenticate(signature, address, authorization: str = None):
+    # Session tokens are only issued to registered users, so there is no need
+    # to look the user up again
+    token = session_token_from_header(authorization)
+    if token is not None:
+        return validate_session_token(token, address)
+
+    if signature is None:
+        logging.warning("Neither signature nor session token given")
+        return False
+
+    return user_can_signin(signature, address)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from lib.cache import TTLCache, MISSING
+
+import threading
+import logging
+import sqlite3
+import json
+import time
+import uuid
+import os
+
+
+# Jobs are polled for shortly after being created, so results don't need to
+# be kept for long
+JOB_EXPIRE_SECONDS = 60 * 60
+
+JOB_WORKERS = 4
+
+
+class MemoryJobStore:
+    # Jobs of this process only. Enough when a single process both serves
+    # the requests and runs the jobs
+
+    def __init__(self, ttl: float = JOB_EXPIRE_SECONDS):
+        self.jobs = TTLCache(max_size=100_000, ttl=ttl)
+
+    def create(self, job_id: str):
+        self.jobs.set(job_id, {"job_id": job_id, "status": "pending"})
+
+    def update(self, job_id: str, **fields):
+        job = self.jobs.get(job_id)
+        if job is not MISSING:
+            self.jobs.set(job_id, {**job, **fields})
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+
+        return None if job is MISSING else job
+
+
+class SQLiteJobStore:
+    # Jobs in a SQLite file, so every uWSGI process can answer the polling
+    # request of a job that was enqueued by another one
+
+    def __init__(self, path: str, ttl: float = JOB_EXPIRE_SECONDS):
+        self.path = path
+        self.ttl = ttl
+
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS job ("
+                "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "fields TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def create(self, job_id: str):
+        now = time.time()
+
+        with self.connect() as connection:
+            connection.execute("DELETE FROM job WHERE created_at < ?", (now - self.ttl,))
+            connection.execute(
+                "INSERT INTO job (job_id, status, fields, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, "pending", "{}", now),
+            )
+
+    def update(self, job_id: str, **fields):
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT status, fields FROM job WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return
+
+            status = fields.pop("status", row[0])
+            connection.execute(
+                "UPDATE job SET status = ?, fields = ? WHERE job_id = ?",
+                (status, json.dumps({**json.loads(row[1]), **fields}), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT status, fields FROM job WHERE job_id = ? AND created_at >= ?",
+                (job_id, time.time() - self.ttl),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {"job_id": job_id, "status": row[0], **json.loads(row[1])}
+
+
+class JobQueue:
+    # Runs jobs on a thread pool outside of the request thread. A job goes
+    # pending -> running -> done (with its result) or failed (with an error)
+
+    def __init__(self, store, workers: int = JOB_WORKERS):
+        self.store = store
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job"
+        )
+
+    def submit(self, fn: Callable[..., Dict[str, Any]], *args) -> str:
+        job_id = str(uuid.uuid4())
+
+        self.store.create(job_id)
+        self.executor.submit(self.run, job_id, fn, *args)
+
+        return job_id
+
+    def run(self, job_id: str, fn: Callable[..., Dict[str, Any]], *args):
+        self.store.update(job_id, status="running")
+
+        try:
+            result = fn(*args)
+        except Exception as e:
+            logging.exception(f"Job {job_id} failed")
+            self.store.update(job_id, status="failed", message=str(e))
+        else:
+            self.store.update(job_id, status="done", **result)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    # Process-wide queue. TRANSACTION_JOBS_DB selects the SQLite store, which
+    # is needed as soon as there is more than one process
+    global _job_queue
+
+    with _job_queue_lock:
+        if _job_queue is None:
+            path = os.environ.get("TRANSACTION_JOBS_DB")
+
+            _job_queue = JobQueue(
+                SQLiteJobStore(path) if path else MemoryJobStore(),
+                workers=int(os.environ.get("TRANSACTION_WORKERS", JOB_WORKERS)),
+            )
+
+        return _job_queue
+
+
+def reset_job_queue():
+    global _job_queue
+
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown()
+
+        _job_queue = None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict
+
+from connexion.apis.flask_api import FlaskApi
+from connexion.apps.flask_app import FlaskJSONEncoder
+from connexion.jsonifier import Jsonifier
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # Optional, `pip install orjson` for faster responses
+    orjson = None
+
+
+# Handles the datetimes, dates and decimals connexion handles for Flask
+encode_default = FlaskJSONEncoder().default
+
+
+def stdlib_dumps(data: Any) -> str:
+    # Compact and UTF-8 like orjson, instead of connexion's indent=2 and
+    # escaped non ASCII characters, the whitespace is a good part of the
+    # encoding time
+    return (
+        json.dumps(
+            data, separators=(",", ":"), ensure_ascii=False, default=encode_default
+        )
+        + "\n"
+    )
+
+
+class StdlibJSON(Jsonifier):
+    def __init__(self):
+        super().__init__(json)
+
+    def dumps(self, data: Any, **kwargs) -> str:
+        return stdlib_dumps(data)
+
+
+class OrjsonJSON(Jsonifier):
+    def __init__(self):
+        super().__init__(orjson)
+
+    def dumps(self, data: Any, **kwargs) -> str:
+        try:
+            encoded = orjson.dumps(
+                data,
+                default=encode_default,
+                # Same datetime format as the stdlib provider
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            # orjson refuses what the stdlib accepts, like non string keys
+            # or integers past 64 bits
+            return stdlib_dumps(data)
+
+        return encoded.decode("utf-8")
+
+    def loads(self, data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Same as connexion, bodies that aren't JSON are kept as strings
+            return data.decode() if isinstance(data, bytes) else data
+
+
+providers: Dict[str, Callable[[], Jsonifier]] = {"json": StdlibJSON}
+if orjson is not None:
+    providers["orjson"] = OrjsonJSON
+
+
+def get_jsonifier(name: str = None) -> Jsonifier:
+    # JSON_PROVIDER picks the provider, orjson when it is installed otherwise
+    if name is None:
+        name = os.environ.get("JSON_PROVIDER", "orjson" if orjson else "json")
+
+    if name not in providers:
+        raise ValueError(
+            f"Unknown JSON provider {name}, expected one of {', '.join(providers)}"
+        )
+
+    return providers[name]()
+
+
+def install(name: str = None) -> Jsonifier:
+    # Connexion serializes every Flask API response, and parses it back when
+    # validating responses, with the jsonifier of FlaskApi
+    jsonifier = get_jsonifier(name)
+    FlaskApi.jsonifier = jsonifier
+
+    return jsonifier
@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+from sqlalchemy import and_, or_
+
+import datetime
+import base64
+import json
+
+
+def encode_cursor(creation_date: datetime.datetime, id: int) -> str:
+    payload = json.dumps([creation_date.isoformat(), id]).encode("utf-8")
+
+    return base64.urlsafe_b64encode(payload).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    # Raises ValueError if the cursor was not created by encode_cursor
+
+    try:
+        creation_date, id = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+
+        return datetime.datetime.fromisoformat(creation_date), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
+
+
+def keyset_page(
+    query, model, count: int, cursor: str | None = None, order: str = "desc"
+) -> Tuple[List[Any], str | None]:
+    # Returns at most `count` rows placed after `cursor` in (creation_date, id)
+    # order and the cursor for the following page (None if this is the last one)
+    #
+    # Rows must expose `creation_date` and `id`, either as model instances or
+    # as columns added to the query
+
+    if order == "asc":
+        query = query.order_by(model.creation_date.asc(), model.id.asc())
+    else:
+        query = query.order_by(model.creation_date.desc(), model.id.desc())
+
+    if cursor is not None:
+        creation_date, id = decode_cursor(cursor)
+
+        if order == "asc":
+            query = query.filter(
+                or_(
+                    model.creation_date > creation_date,
+                    and_(model.creation_date == creation_date, model.id > id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    model.creation_date < creation_date,
+                    and_(model.creation_date == creation_date, model.id < id),
+                )
+            )
+
+    # Fetch one extra row to know whether there is a next page without counting
+    rows = query.limit(count + 1).all()
+    items = rows[:count]
+
+    next_cursor = None
+    if len(rows) > count:
+        next_cursor = encode_cursor(items[-1].creation_date, items[-1].id)
+
+    return items, next_cursor
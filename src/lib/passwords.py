@@ -0,0 +1,132 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import threading
+import hashlib
+import os
+
+
+class PasswordHasherBusy(Exception):
+    # Every hashing slot is taken, the request should be retried later
+    pass
+
+
+@dataclass(frozen=True)
+class ScryptParams:
+    n: int
+    r: int
+    p: int
+
+    def encode(self) -> str:
+        return f"scrypt:{self.n}:{self.r}:{self.p}"
+
+    @staticmethod
+    def decode(params: Optional[str]) -> ScryptParams:
+        # Hashes stored before the parameters were recorded used the defaults
+        if params is None:
+            return DEFAULT_PARAMS
+
+        _, n, r, p = params.split(":")
+
+        return ScryptParams(int(n), int(r), int(p))
+
+
+DEFAULT_PARAMS = ScryptParams(n=16384, r=8, p=1)
+
+
+def current_params() -> ScryptParams:
+    # Parameters new hashes are created with. Users whose hash was created
+    # with different ones are rehashed the next time they log in
+    return ScryptParams(
+        n=int(os.environ.get("PASSWORD_SCRYPT_N", DEFAULT_PARAMS.n)),
+        r=int(os.environ.get("PASSWORD_SCRYPT_R", DEFAULT_PARAMS.r)),
+        p=int(os.environ.get("PASSWORD_SCRYPT_P", DEFAULT_PARAMS.p)),
+    )
+
+
+def scrypt(password: str, salt: str, params: ScryptParams) -> str:
+    # Runs in the pool processes, so it must stay a module level function
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt.encode("utf-8"),
+        n=params.n,
+        r=params.r,
+        p=params.p,
+        # n=16384, r=8 needs 16 MiB, leave room for larger costs
+        maxmem=256 * params.n * params.r + 1024 * 1024,
+        dklen=64,
+    ).hex()
+
+
+class PasswordHasher:
+    # Hashes passwords on a pool of `workers` processes, so a burst of logins
+    # doesn't hold the GIL and memory of the request workers. At most
+    # `workers + queue_size` hashes wait or run at once, past that hash
+    # raises PasswordHasherBusy right away instead of queueing the request.
+    # With 0 workers hashes run inline, still bounded by queue_size
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.executor = (
+            ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        )
+
+    def hash(self, password: str, salt: str, params: ScryptParams) -> str:
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+
+        try:
+            if self.executor is None:
+                return scrypt(password, salt, params)
+
+            return self.executor.submit(scrypt, password, salt, params).result()
+        finally:
+            self.slots.release()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    # One pool per process, created on first use so uWSGI workers don't
+    # share the pool of the master
+    global _password_hasher
+
+    with _password_hasher_lock:
+        if _password_hasher is None:
+            workers = int(
+                os.environ.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+            )
+
+            _password_hasher = PasswordHasher(
+                workers=workers,
+                queue_size=int(
+                    os.environ.get("PASSWORD_HASH_QUEUE", 2 * max(workers, 1))
+                ),
+            )
+
+        return _password_hasher
+
+
+def reset_password_hasher():
+    global _password_hasher
+
+    with _password_hasher_lock:
+        if _password_hasher is not None:
+            _password_hasher.shutdown()
+
+        _password_hasher = None
+
+
+def hash_password(password: str, salt: str, params: Optional[ScryptParams] = None):
+    return get_password_hasher().hash(
+        password, salt, params if params is not None else current_params()
+    )
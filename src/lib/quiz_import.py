@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import itertools
+import json
+import csv
+
+from model import Quiz
+
+
+BATCH_SIZE = 500
+
+# (row number, quiz or None if it could not be parsed, errors)
+Row = Tuple[int, Optional[Dict[str, Any]], List[str]]
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Row]:
+    # One quiz object per line, blank lines are ignored
+
+    for row, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield row, json.loads(line), []
+        except ValueError as e:
+            yield row, None, [f"invalid json: {e}"]
+
+
+def read_csv(stream: TextIO) -> Iterator[Row]:
+    # Same columns as the quiz table export: creator_name, questions (a json
+    # list) and optionally creator_stake_address. Other columns are ignored
+
+    reader = csv.DictReader(stream)
+
+    for row, record in enumerate(reader, start=1):
+        quiz = {"creator_name": record.get("creator_name")}
+
+        if record.get("creator_stake_address"):
+            quiz["creator_stake_address"] = record["creator_stake_address"]
+
+        try:
+            quiz["questions"] = json.loads(record.get("questions") or "")
+        except ValueError as e:
+            yield row, None, [f"questions: invalid json: {e}"]
+            continue
+
+        yield row, quiz, []
+
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+
+def validate_question(question: Any) -> List[str]:
+    if not isinstance(question, dict):
+        return ["must be an object"]
+
+    errors = []
+
+    if not isinstance(question.get("question"), str) or not question["question"]:
+        errors.append("question: must be a non empty string")
+
+    answers = question.get("answers")
+    if (
+        not isinstance(answers, list)
+        or len(answers) < 2
+        or not all(isinstance(answer, str) for answer in answers)
+    ):
+        errors.append("answers: must be a list of at least 2 strings")
+        answers = None
+
+    right_answer = question.get("right_answer")
+    if not isinstance(right_answer, int) or isinstance(right_answer, bool):
+        errors.append("right_answer: must be an integer")
+    elif answers is not None and not 0 <= right_answer < len(answers):
+        errors.append(
+            f"right_answer: {right_answer} is not an index of the {len(answers)} answers"
+        )
+
+    hints = question.get("hints")
+    if not isinstance(hints, list) or not all(isinstance(hint, str) for hint in hints):
+        errors.append("hints: must be a list of strings")
+
+    return errors
+
+
+def validate_quiz(quiz: Any) -> List[str]:
+    if not isinstance(quiz, dict):
+        return ["must be an object"]
+
+    errors = []
+
+    if not isinstance(quiz.get("creator_name"), str) or not quiz["creator_name"]:
+        errors.append("creator_name: must be a non empty string")
+
+    creator_stake_address = quiz.get("creator_stake_address")
+    if creator_stake_address is not None and not isinstance(
+        creator_stake_address, str
+    ):
+        errors.append("creator_stake_address: must be a string")
+
+    questions = quiz.get("questions")
+    if not isinstance(questions, list) or len(questions) == 0:
+        errors.append("questions: must be a non empty list")
+    else:
+        for i, question in enumerate(questions):
+            errors += [f"questions[{i}].{error}" for error in validate_question(question)]
+
+    return errors
+
+
+def import_quizzes(rows: Iterable[Row], batch_size: int = BATCH_SIZE) -> dict:
+    # Validates the parsed rows and inserts the valid ones, `batch_size` quizzes
+    # per INSERT, so the input is never held in memory all at once. Invalid rows
+    # are skipped and reported back with their errors
+
+    report = {"imported": 0, "quizzes": [], "errors": []}
+
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+
+        valid = []
+        for row, quiz, errors in batch:
+            if quiz is not None:
+                errors = errors + validate_quiz(quiz)
+
+            if errors:
+                report["errors"].append({"row": row, "errors": errors})
+            else:
+                valid.append((row, quiz))
+
+        quiz_ids = Quiz.bulk_create([quiz for _, quiz in valid])
+
+        report["imported"] += len(quiz_ids)
+        report["quizzes"] += [
+            {"row": row, "quiz_id": quiz_id}
+            for (row, _), quiz_id in zip(valid, quiz_ids)
+        ]
+
+    return report
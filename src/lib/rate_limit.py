@@ -0,0 +1,154 @@
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+
+import threading
+import sqlite3
+import math
+import time
+import os
+
+
+# name -> (bucket capacity, seconds to refill it completely)
+LIMITS = {
+    "ip": (20, 60),
+    "account": (5, 60),
+}
+
+
+def refill(
+    tokens: float, updated_at: float, now: float, capacity: int, period: float
+) -> float:
+    return min(capacity, tokens + (now - updated_at) * capacity / period)
+
+
+class MemoryBackend:
+    # Buckets of this process only
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        # key -> (tokens, updated at, period)
+        self.buckets: Dict[str, Tuple[float, float, float]] = {}
+        self.lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, period: float) -> float:
+        # Takes a token from the bucket. Returns 0 if there was one, otherwise
+        # how many seconds until there is
+        now = time.monotonic()
+
+        with self.lock:
+            tokens, updated_at, _ = self.buckets.get(key, (capacity, now, period))
+            tokens = refill(tokens, updated_at, now, capacity, period)
+
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now, period)
+                wait = 0.0
+            else:
+                self.buckets[key] = (tokens, now, period)
+                wait = (1 - tokens) * period / capacity
+
+            if len(self.buckets) > self.max_size:
+                # Buckets untouched for a whole period are full again, which
+                # is the same as having no bucket
+                self.buckets = {
+                    key: bucket
+                    for key, bucket in self.buckets.items()
+                    if now - bucket[1] < bucket[2]
+                }
+
+            return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SQLiteBackend:
+    # Buckets in a SQLite file shared by every uWSGI process of the host, a
+    # stand-in for a shared store like Redis
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS bucket ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def take(self, key: str, capacity: int, period: float) -> float:
+        # Wall clock, as it is compared between processes
+        now = time.time()
+
+        connection = self.connect()
+        try:
+            # Lock the database so concurrent takes can't both see a token
+            connection.execute("BEGIN IMMEDIATE")
+
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM bucket WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated_at = row if row is not None else (capacity, now)
+            tokens = refill(tokens, updated_at, now, capacity, period)
+
+            wait = 0.0 if tokens >= 1 else (1 - tokens) * period / capacity
+            if wait == 0:
+                tokens -= 1
+
+            connection.execute(
+                "INSERT OR REPLACE INTO bucket (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+        return wait
+
+    def clear(self):
+        with self.connect() as connection:
+            connection.execute("DELETE FROM bucket")
+
+
+class RateLimiter:
+    # Token buckets per (limit name, key). Every request takes a token from
+    # each of its buckets, a bucket refills at capacity / period tokens a second
+
+    def __init__(self, backend, limits: Dict[str, Tuple[int, float]] = LIMITS):
+        self.backend = backend
+        self.limits = limits
+
+    def retry_after(self, **keys: str) -> Optional[int]:
+        # Returns None if the request is allowed, otherwise the seconds to
+        # wait before retrying. e.g. retry_after(ip="1.2.3.4", account="alice")
+        wait = 0.0
+        for name, key in keys.items():
+            capacity, period = self.limits[name]
+            wait = max(wait, self.backend.take(f"{name}:{key}", capacity, period))
+
+        return math.ceil(wait) if wait > 0 else None
+
+    def clear(self):
+        self.backend.clear()
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    # RATE_LIMIT_DB selects the SQLite backend, so every process of the host
+    # shares the same buckets
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            path = os.environ.get("RATE_LIMIT_DB")
+
+            _rate_limiter = RateLimiter(
+                SQLiteBackend(path) if path else MemoryBackend()
+            )
+
+        return _rate_limiter
@@ -0,0 +1,121 @@
+from __future__ import annotations
+from typing import Callable, Hashable, Optional
+
+from flask import Response, request
+
+from lib.cache import TTLCache
+
+import functools
+import threading
+import hashlib
+import json
+import os
+
+
+# Entries are only invalidated in the process that did the write, the TTL
+# bounds how stale the other uWSGI workers can be
+TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 30))
+MAX_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 10_000))
+
+
+def etag(body: dict) -> str:
+    # Hash of the content, so a rebuilt but unchanged response keeps its ETag
+    encoded = json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    # Bodies of successful GET responses by (namespace, key), with their ETag
+
+    def __init__(self, max_size: int, ttl: float):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+
+        # Bumped on every invalidation, a response built while a write
+        # happened may be stale and isn't stored
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, namespace: str, key: Hashable):
+        return self.entries.get((namespace, key), None)
+
+    def set(self, namespace: str, key: Hashable, body: dict, generation: int) -> str:
+        tag = etag(body)
+
+        with self.lock:
+            if generation == self.generation:
+                self.entries.set((namespace, key), (body, tag))
+
+        return tag
+
+    def invalidate(self, namespace: str, key: Hashable):
+        with self.lock:
+            self.generation += 1
+            self.entries.delete((namespace, key))
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+
+response_cache = ResponseCache(max_size=MAX_SIZE, ttl=TTL)
+
+
+def respond(body: dict, tag: str):
+    headers = {"ETag": f'"{tag}"', "Cache-Control": "no-cache"}
+
+    if request.if_none_match.contains_weak(tag):
+        return Response(status=304, headers=headers)
+
+    return body, 200, headers
+
+
+def cached(
+    namespace: str, argument: str, version: Optional[Callable] = None
+) -> Callable:
+    # Caches the 200 responses of a GET handler by its `argument` and answers
+    # If-None-Match with 304 when the ETag still matches. Write paths call
+    # invalidate with the same namespace and key
+    #
+    # For rows that also change outside the API, `version(argument)` returns
+    # their current version and is part of the key, so a bumped version is a
+    # cache miss in every worker
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            key = kwargs[argument]
+            if version is not None:
+                key = (key, version(key))
+
+            entry = response_cache.get(namespace, key)
+            if entry is not None:
+                return respond(*entry)
+
+            generation = response_cache.generation
+            result = handler(*args, **kwargs)
+
+            body, status = result if isinstance(result, tuple) else (result, 200)
+            if status != 200:
+                return result
+
+            return respond(body, response_cache.set(namespace, key, body, generation))
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(namespace: str, key: Hashable):
+    response_cache.invalidate(namespace, key)
+
+
+def invalidate_project(project_identifier: Optional[str] = None):
+    # Every response rendered from the project. None is for writes touching
+    # every project, the TTLCache can't be scanned so it is cleared
+    if project_identifier is None:
+        response_cache.clear()
+        return
+
+    for namespace in ("project", "submissions"):
+        invalidate(namespace, project_identifier)
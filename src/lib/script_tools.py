@@ -1,15 +1,49 @@
 from __future__ import annotations
 from lib import cardano_types
+from athena_providers import get_provider, provider_name
 from typing import Dict, Tuple, List
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 import pycardano as pyc
+import functools
+import threading
 import logging
 import cbor2
+import time
 import sys
 import os
 
 
+@dataclass(frozen=True)
+class CompiledScript:
+    script: pyc.PlutusV2Script
+    script_hash: pyc.ScriptHash
+    testnet_address: pyc.Address
+    mainnet_address: pyc.Address
+
+    def address(self, network: pyc.Network) -> pyc.Address:
+        if network == pyc.Network.MAINNET:
+            return self.mainnet_address
+
+        return self.testnet_address
+
+
+@functools.lru_cache(maxsize=32)
+def compile_script(script_hex: str) -> CompiledScript:
+    # Decodes and hashes a script once per distinct script content, so every
+    # transaction builder and every script version share the same result
+    script = pyc.PlutusV2Script(cbor2.loads(bytes.fromhex(script_hex)))
+    script_hash = pyc.plutus_script_hash(script)
+
+    return CompiledScript(
+        script=script,
+        script_hash=script_hash,
+        testnet_address=pyc.Address(script_hash, network=pyc.Network.TESTNET),
+        mainnet_address=pyc.Address(script_hash, network=pyc.Network.MAINNET),
+    )
+
+
 def create_transaction_fund_project(
     chain_context: pyc.ChainContext,
     registered_address: pyc.Address,
@@ -20,11 +54,9 @@ def create_transaction_fund_project(
     target_address: pyc.Address,
     deadline: int,
 ):
-    escrow_script = cbor2.loads(bytes.fromhex(script_hex))
-    script_hash = pyc.plutus_script_hash(pyc.PlutusV2Script(escrow_script))
-    script_address = pyc.Address(script_hash, network=pyc.Network.TESTNET)
+    script_address = compile_script(script_hex).address(pyc.Network.TESTNET)
 
-    print("Address", script_address)
+    logging.debug(f"Address {script_address}")
 
     builder = pyc.TransactionBuilder(chain_context)
 
@@ -64,13 +96,13 @@ def create_transaction_fallback_project(
     script_utxo: pyc.UTxO,
     script_datum: pyc.Datum,
 ):
-    escrow_script = cbor2.loads(bytes.fromhex(script_hex))
+    escrow_script = compile_script(script_hex).script
 
     # Current slot - Don't know how to calculate the actual current slot
     # Maybe get the posix time of the last block and use that difference
     current_slot = chain_context.last_block_slot
 
-    print("Current slot", current_slot)
+    logging.debug(f"Current slot {current_slot}")
 
     builder = pyc.TransactionBuilder(chain_context)
 
@@ -84,7 +116,7 @@ def create_transaction_fallback_project(
 
     builder.add_script_input(
         script_utxo,
-        pyc.PlutusV2Script(escrow_script),
+        escrow_script,
         script_datum,
         pyc.Redeemer(
             pyc.RedeemerTag.SPEND,
@@ -112,13 +144,13 @@ def create_transaction_target_project(
     script_utxo: pyc.UTxO,
     script_datum: pyc.Datum,
 ):
-    escrow_script = cbor2.loads(bytes.fromhex(script_hex))
+    escrow_script = compile_script(script_hex).script
 
     # Current slot - Don't know how to calculate the actual current slot
     # Maybe get the posix time of the last block and use that difference
     current_slot = chain_context.last_block_slot
 
-    print("Current slot", current_slot)
+    logging.debug(f"Current slot {current_slot}")
 
     builder = pyc.TransactionBuilder(chain_context)
 
@@ -130,7 +162,7 @@ def create_transaction_target_project(
 
     builder.add_script_input(
         script_utxo,
-        pyc.PlutusV2Script(escrow_script),
+        escrow_script,
         script_datum,
         pyc.Redeemer(
             pyc.RedeemerTag.SPEND,
@@ -151,35 +183,52 @@ def create_transaction_target_project(
     return transaction
 
 
-def initialise_cardano():
+CARDANO_ENVS = [
+    "NETWORK_MODE",
+    "SCRIPT_PATH",
+    "MEDIATOR_POLICY",
+]
+
+# How long a cached chain context is reused before it is rebuilt, which
+# refreshes the protocol and genesis parameters it has fetched
+CHAIN_CONTEXT_TTL_SECONDS = 10 * 60
+
+
+def load_cardano_envs() -> Dict[str, str]:
     # Initialise env variables, if any of them are not
-    # here, raise exception
+    # here, raise exception. The chain context provider comes from
+    # config.json and may need env variables of its own
     sys.path.append("src")
     load_dotenv()
 
-    envs = {}
-    for env in [
-        "BLOCKFROST_PROJECT_ID",
-        "BLOCKFROST_BASE_URL",
-        "NETWORK_MODE",
-        "SCRIPT_PATH",
-        "MEDIATOR_POLICY",
-    ]:
+    provider = provider_name()
+
+    envs = {"ATHENA_PROVIDER": provider}
+    for env in CARDANO_ENVS + get_provider(provider).envs:
         val = os.environ.get(env)
         if val is None:
             raise ValueError(f"Env variable {env} not found!")
 
         envs[env] = val
 
-    # ChainContext will depend on the environment variables
-    chain_context = pyc.BlockFrostChainContext(
-        project_id=envs["BLOCKFROST_PROJECT_ID"],
-        base_url=envs["BLOCKFROST_BASE_URL"],
-        network=pyc.Network.MAINNET
+    return envs
+
+
+def create_chain_context(envs: Dict[str, str]) -> pyc.ChainContext:
+    # ChainContext will depend on the provider and environment variables
+    return get_provider(envs["ATHENA_PROVIDER"]).create(
+        envs,
+        pyc.Network.MAINNET
         if envs["NETWORK_MODE"].lower() == "mainnet"
         else pyc.Network.TESTNET,
     )
 
+
+def initialise_cardano():
+    envs = load_cardano_envs()
+
+    chain_context = create_chain_context(envs)
+
     with open(envs["SCRIPT_PATH"], "r") as f:
         script = f.read()
 
@@ -190,6 +239,66 @@ def initialise_cardano():
     }
 
 
+_cardano_handler = None
+_cardano_handler_created_at = 0.0
+_cardano_handler_refreshing = False
+_cardano_handler_lock = threading.Lock()
+
+
+def get_cardano_handler(ttl: float = CHAIN_CONTEXT_TTL_SECONDS):
+    # Process-wide version of initialise_cardano. Env variables and the script
+    # are read once, the chain context is rebuilt once it is older than ttl.
+    # It is built without holding the lock, as creating it queries the
+    # provider, and requests keep the stale handler while one thread
+    # rebuilds it
+    global _cardano_handler, _cardano_handler_created_at, _cardano_handler_refreshing
+
+    with _cardano_handler_lock:
+        handler = _cardano_handler
+
+        if handler is not None:
+            fresh = time.monotonic() - _cardano_handler_created_at < ttl
+            if fresh or _cardano_handler_refreshing:
+                return handler
+
+            _cardano_handler_refreshing = True
+
+    try:
+        if handler is None:
+            new_handler = initialise_cardano()
+        else:
+            new_handler = {
+                **handler,
+                "chain_context": create_chain_context(load_cardano_envs()),
+            }
+    except Exception:
+        if handler is not None:
+            with _cardano_handler_lock:
+                _cardano_handler_refreshing = False
+
+        raise
+
+    with _cardano_handler_lock:
+        if handler is not None:
+            _cardano_handler_refreshing = False
+
+        # Unless another thread initialised it first or it was reset meanwhile
+        if _cardano_handler is handler:
+            _cardano_handler = new_handler
+            _cardano_handler_created_at = time.monotonic()
+
+        return _cardano_handler if _cardano_handler is not None else new_handler
+
+
+def reset_cardano_handler():
+    # Drops the cached handler so the next call initialises everything again
+    global _cardano_handler, _cardano_handler_created_at
+
+    with _cardano_handler_lock:
+        _cardano_handler = None
+        _cardano_handler_created_at = 0.0
+
+
 def cbor_to_utxo(utxo_cbor: str) -> pyc.UTxO:
     cbor_lst = cbor2.loads(bytes.fromhex(utxo_cbor))
     transaction_input_cbor_bytes = cbor2.dumps(cbor_lst[0])
@@ -201,3 +310,74 @@ def cbor_to_utxo(utxo_cbor: str) -> pyc.UTxO:
     )
 
     return utxo
+
+
+# What malformed UTxO data raises while decoding. pycardano checks hash and
+# key sizes with assertions
+UTXO_DECODE_ERRORS = (
+    cbor2.CBORDecodeError,
+    pyc.DecodingException,
+    pyc.DeserializeException,
+    pyc.InvalidDataException,
+    AssertionError,
+    ValueError,
+    TypeError,
+    KeyError,
+    IndexError,
+)
+
+
+def output_from_primitive(output) -> pyc.TransactionOutput:
+    # pycardano resolves the type hints of array serializables on every
+    # from_primitive call, which dominates decoding. Legacy outputs, the ones
+    # wallets send, are built directly with the same fields
+    # TransactionOutput.from_primitive gives them
+    if isinstance(output, list) and len(output) in (2, 3):
+        amount = output[1]
+        if isinstance(amount, list):
+            coin, multi_asset = amount
+            if not isinstance(multi_asset, dict):
+                raise ValueError(f"Invalid multi asset {multi_asset}")
+
+            amount = pyc.Value(coin, pyc.MultiAsset.from_primitive(multi_asset))
+
+        return pyc.TransactionOutput(
+            pyc.Address.from_primitive(output[0]),
+            amount,
+            datum=pyc.DatumHash(output[2]) if len(output) == 3 else None,
+        )
+
+    return pyc.TransactionOutput.from_primitive(output)
+
+
+def cbor_to_utxos(utxo_cbors: List[str]) -> List[pyc.UTxO]:
+    # Batch version of cbor_to_utxo. Each entry is decoded once and its
+    # input and output are built from the decoded values, instead of being
+    # encoded again for from_cbor. Raises ValueError for entries that are not
+    # a valid [input, output] pair and for inputs listed more than once
+    utxos = []
+    seen = set()
+
+    for i, utxo_cbor in enumerate(utxo_cbors):
+        try:
+            transaction_input, transaction_output = cbor2.loads(
+                bytes.fromhex(utxo_cbor)
+            )
+
+            transaction_id, index = transaction_input
+
+            utxo = pyc.UTxO(
+                pyc.TransactionInput(pyc.TransactionId(transaction_id), index),
+                output_from_primitive(transaction_output),
+            )
+        except UTXO_DECODE_ERRORS as e:
+            # Anything else is a bug, not bad input, and propagates
+            raise ValueError(f"Invalid UTxO at index {i}: {e}") from e
+
+        if utxo.input in seen:
+            raise ValueError(f"Duplicate UTxO {utxo.input} at index {i}")
+
+        seen.add(utxo.input)
+        utxos.append(utxo)
+
+    return utxos
@@ -11,6 +11,7 @@ from .quiz import Quiz
 from .quiz_assignment import QuizAssignment
 from .powerup import PowerUp
 from .attempt_answer import AttemptAnswer
+from .answer_count import AnswerCount
 from .review import Review
 from .submission import Submission
 from .prod_user import ProdUser
\ No newline at end of file
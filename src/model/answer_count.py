@@ -0,0 +1,40 @@
+from . import db
+
+from sqlalchemy import ForeignKey
+from typing import Dict
+
+from .dialect import insert
+
+
+class AnswerCount(db.Model):
+    # How many times each answer was attempted for a quiz question, incremented
+    # whenever an AttemptAnswer is inserted so stats don't scan every attempt
+    __tablename__ = "answer_count"
+
+    quiz_id = db.Column(db.Integer, ForeignKey("quiz.id"), primary_key=True)
+    question_index = db.Column(db.Integer, primary_key=True)
+    answer = db.Column(db.Integer, primary_key=True)
+
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+    @staticmethod
+    def increment(connection, quiz_id: int, question_index: int, answer: int):
+        statement = insert(AnswerCount.__table__, connection).values(
+            quiz_id=quiz_id, question_index=question_index, answer=answer, count=1
+        )
+
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["quiz_id", "question_index", "answer"],
+                set_={"count": AnswerCount.__table__.c.count + 1},
+            )
+        )
+
+    @staticmethod
+    def question_stats(quiz_id: int, question_index: int) -> Dict[int, int]:
+        counts = AnswerCount.query.filter(
+            AnswerCount.quiz_id == quiz_id,
+            AnswerCount.question_index == question_index,
+        ).with_entities(AnswerCount.answer, AnswerCount.count)
+
+        return {answer: count for answer, count in counts}
@@ -1,15 +1,19 @@
 from . import db
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, func, event
 from typing import List, Dict
 
 from .quiz import Quiz
 from .user import User
+from .answer_count import AnswerCount
 
 
 class AttemptAnswer(db.Model):
     __tablename__ = "attempt_answer"
+    __table_args__ = (
+        db.Index("ix_attempt_answer_quiz_id_question_index", "quiz_id", "question_index"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -34,27 +38,26 @@ class AttemptAnswer(db.Model):
             quiz_id=quiz.id,
             answer=answer,
             question_index=question_index,
-            right_answer=quiz.questions[question_index]["right_answer"]
+            right_answer=quiz.definition().questions[question_index]["right_answer"]
             == answer,
         )
 
+        # Committed by the caller along with the quiz assignment state
         db.session.add(attempt_answer)
-        db.session.commit()
 
         return attempt_answer
 
-    
     @staticmethod
     def quiz_stats(quiz: Quiz, question_index: int) -> Dict[int, int]:
-        query = AttemptAnswer.query.filter(
-            AttemptAnswer.quiz_id == quiz.id,
-            AttemptAnswer.question_index == question_index,
-        )
+        return AnswerCount.question_stats(quiz.id, question_index)
 
-        stats = query.with_entities(
-            AttemptAnswer.answer, func.count(AttemptAnswer.answer)
-        ).group_by(AttemptAnswer.answer).all()
-        
-        print({stat[0]: stat[1] for stat in stats})
 
-        return {stat[0]: stat[1] for stat in stats}
+@event.listens_for(AttemptAnswer, "after_insert")
+def count_answer(mapper, connection, attempt_answer: AttemptAnswer):
+    # Runs in the same transaction as the attempt itself
+    AnswerCount.increment(
+        connection,
+        attempt_answer.quiz_id,
+        attempt_answer.question_index,
+        attempt_answer.answer,
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from . import db
+
+
+def insert(table, bind=None):
+    # INSERT for the dialect in use, which allows ON CONFLICT clauses
+    # (on_conflict_do_nothing / on_conflict_do_update)
+
+    if (bind if bind is not None else db.engine).dialect.name == "postgresql":
+        return postgresql.insert(table)
+
+    return sqlite.insert(table)
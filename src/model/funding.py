@@ -6,8 +6,21 @@ from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey, func
 
 
+# Statuses counted in the project funding aggregates
+COUNTED_STATUSES = ("submitted", "onchain")
+
+
 class Funding(db.Model):
     __tablename__ = "funding"
+    __table_args__ = (
+        db.Index(
+            "ix_funding_funder_id_project_id_status", "funder_id", "project_id", "status"
+        ),
+        # Project.apply_funding and refresh_funding_totals filter by project
+        db.Index(
+            "ix_funding_project_id_funder_id_status", "project_id", "funder_id", "status"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -30,6 +43,13 @@ class Funding(db.Model):
         timezone=False), server_default=func.now(), nullable=False)
     update_date = db.Column(db.DateTime(timezone=False), onupdate=func.now())
 
+    def update_status(self, status: str):
+        self.project.lock()
+
+        previous_status = self.status
+        self.status = status
+        self.project.apply_funding(self, previous_status)
+
     def parse(self) -> dict:
         return {
             "user": self.funder.parse(),
@@ -6,13 +6,23 @@ from typing import List, Callable, Dict, Any
 
 from .quiz_assignment import QuizAssignment
 from .attempt_answer import AttemptAnswer
+from .dialect import insert
 
 import random
 import copy
 
 
+# Powerups that can be granted, each is a PowerUp method of the same name
+POWERUP_NAMES = ["get_hints", "get_percentages", "skip_question", "eliminate_half"]
+
+
 class PowerUp(db.Model):
     __tablename__ = "powerup"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "quiz_assignment_id", "name", name="uq_powerup_quiz_assignment_id_name"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -37,13 +47,14 @@ class PowerUp(db.Model):
             "question_index_used": self.question_index_used,
         }
 
+    def question(self, question_index: int) -> dict:
+        return self.quiz_assignment.quiz.definition().questions[question_index]
+
     def get_hints(self, question_index: int) -> str:
         random.seed(self.id)
 
         return {
-            "hint": random.choice(
-                self.quiz_assignment.quiz.questions[question_index]["hints"]
-            )
+            "hint": random.choice(self.question(question_index)["hints"])
         }
 
     def get_percentages(self, question_index: int) -> Dict[int, float]:
@@ -55,19 +66,12 @@ class PowerUp(db.Model):
 
         # Avoid division by zero
         if total == 0:
-            result = [
-                0
-                for _ in range(
-                    len(self.quiz_assignment.quiz.questions[question_index]["answers"])
-                )
-            ]
+            result = [0 for _ in range(len(self.question(question_index)["answers"]))]
         else:
             # Result should include very possible choice (0% if no one has chosen it)
             result = [
                 stats.get(i, 0) / total
-                for i, _ in enumerate(
-                    self.quiz_assignment.quiz.questions[question_index]["answers"]
-                )
+                for i, _ in enumerate(self.question(question_index)["answers"])
             ]
 
         return {"percentages": result}
@@ -76,19 +80,17 @@ class PowerUp(db.Model):
         # Returns the right answer for this question index
 
         return {
-            "answer": self.quiz_assignment.quiz.questions[question_index][
-                "right_answer"
-            ],
+            "answer": self.question(question_index)["right_answer"],
         }
 
     def eliminate_half(self, question_index: int) -> Dict[str, List[str]]:
         random.seed(self.id)
 
-        questions_copy = copy.deepcopy(self.quiz_assignment.quiz.questions)
+        question_copy = copy.deepcopy(self.question(question_index))
 
         # Make sure we don't eliminate the right answer
-        choices = questions_copy[question_index]["answers"]
-        right_answer = questions_copy[question_index]["right_answer"]
+        choices = question_copy["answers"]
+        right_answer = question_copy["right_answer"]
 
         answer_content = choices[right_answer]
 
@@ -101,19 +103,14 @@ class PowerUp(db.Model):
         remainder.append(answer_content)
 
         result = []
-        for choice in self.quiz_assignment.quiz.questions[question_index]["answers"]:
+        for choice in self.question(question_index)["answers"]:
             if choice in remainder:
                 result.append(choice)
 
         return {"remaining_choices": result}
 
     def powerups_map(self) -> Dict[str, Callable[["PowerUp", int], dict]]:
-        return {
-            "get_hints": self.get_hints,
-            "get_percentages": self.get_percentages,
-            "skip_question": self.skip_question,
-            "eliminate_half": self.eliminate_half,
-        }
+        return {name: getattr(self, name) for name in POWERUP_NAMES}
 
     def use_powerup(self) -> Dict[str, Any]:
         if self.used is False:
@@ -142,6 +139,38 @@ class PowerUp(db.Model):
 
         return powerup
 
+    @staticmethod
+    def bulk_create(quiz_assignment_ids: List[int], names: List[str]) -> int:
+        # Grants every powerup in names to every quiz assignment in one
+        # INSERT. Powerups the assignment already has are skipped by the
+        # (quiz_assignment_id, name) unique constraint. Returns how many
+        # powerups were created, raises ValueError for unknown names
+        unknown = [name for name in names if name not in POWERUP_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown powerups {', '.join(unknown)}")
+
+        if not quiz_assignment_ids or not names:
+            return 0
+
+        result = db.session.execute(
+            insert(PowerUp.__table__)
+            .values(
+                [
+                    {
+                        "quiz_assignment_id": quiz_assignment_id,
+                        "name": name,
+                        "used": False,
+                    }
+                    for quiz_assignment_id in quiz_assignment_ids
+                    for name in dict.fromkeys(names)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["quiz_assignment_id", "name"])
+        )
+        db.session.commit()
+
+        return result.rowcount
+
     @staticmethod
     def sample(
         quiz_assignment: List[QuizAssignment] = -1, name: str = -1, used: bool = -1
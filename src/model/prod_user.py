@@ -1,9 +1,10 @@
 import uuid
+import hmac
 import string
 import random
-import hashlib
 
 from . import db
+from lib import passwords
 
 from sqlalchemy.orm import relationship
 from sqlalchemy import func
@@ -19,11 +20,10 @@ def generate_salt(length=16):
     return "".join(random.choice(characters) for _ in range(length))
 
 
-def hash_password(password: str, salt: str):
-    salted_password = salt.encode("utf-8")
-    return hashlib.scrypt(
-        password.encode("utf-8"), salt=salted_password, n=16384, r=8, p=1, dklen=64
-    ).hex()
+def hash_password(password: str, salt: str, params: passwords.ScryptParams = None):
+    # Hashed on the password hasher pool, raises passwords.PasswordHasherBusy
+    # when it is saturated
+    return passwords.hash_password(password, salt, params)
 
 
 class ProdUser(db.Model):
@@ -34,6 +34,8 @@ class ProdUser(db.Model):
 
     salt = db.Column(db.String(), nullable=False)
     password_hash = db.Column(db.String(), nullable=False)
+    # Scrypt parameters of password_hash, None for the original defaults
+    password_params = db.Column(db.String())
 
     stake_address = db.Column(db.String())
     payment_address = db.Column(db.String())
@@ -52,22 +54,41 @@ class ProdUser(db.Model):
         if not user:
             return None
 
-        password_hash = hash_password(password, user.salt)
+        params = passwords.ScryptParams.decode(user.password_params)
+        password_hash = hash_password(password, user.salt, params)
 
-        if password_hash != user.password_hash:
+        if not hmac.compare_digest(password_hash, user.password_hash):
             return None
 
+        # Upgrade hashes created with other parameters now that we know the
+        # password. The user is authenticated already, so when the hasher is
+        # busy the upgrade waits for a later login instead of failing this one
+        current_params = passwords.current_params()
+        if params != current_params:
+            try:
+                password_hash = hash_password(password, user.salt, current_params)
+            except passwords.PasswordHasherBusy:
+                return user
+
+            user.password_hash = password_hash
+            user.password_params = current_params.encode()
+
+            db.session.add(user)
+            db.session.commit()
+
         return user
 
     @staticmethod
     def register(email: str, password: str):
         salt = generate_salt()
-        password_hash = hash_password(password, salt)
+        params = passwords.current_params()
+        password_hash = hash_password(password, salt, params)
 
         user = ProdUser(
             email=email,
             salt=salt,
             password_hash=password_hash,
+            password_params=params.encode(),
         )
 
         db.session.add(user)
@@ -1,9 +1,8 @@
-import uuid
-
 from . import db
+from .types import UUIDString, str_uuid7
 
-from sqlalchemy.orm import relationship
-from sqlalchemy import ForeignKey, func
+from sqlalchemy.orm import relationship, joinedload, selectinload
+from sqlalchemy import ForeignKey, func, case, select
 
 from model.project_subject_association import (
     association_table as subjects_association_table,
@@ -18,7 +17,11 @@ class Project(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     project_identifier = db.Column(
-        db.String(64), default=lambda: str(uuid.uuid4()), nullable=False
+        UUIDString,
+        default=str_uuid7,
+        nullable=False,
+        unique=True,
+        index=True,
     )
 
     creator_id = db.Column(db.Integer, ForeignKey("user.id"), nullable=False)
@@ -40,6 +43,12 @@ class Project(db.Model):
         "User", secondary=mediator_association_table, back_populates="mediated_projects"
     )
     funding = relationship("Funding", back_populates="project")
+
+    # Funding aggregates, kept up to date by refresh_funding_totals whenever
+    # a Funding row for this project is written
+    total_funding_amount = db.Column(db.BigInteger, default=0, nullable=False)
+    onchain_funding_amount = db.Column(db.BigInteger, default=0, nullable=False)
+    funder_count = db.Column(db.Integer, default=0, nullable=False)
     submissions = relationship("Submission", back_populates="project")
 
     disqualified = db.Column(db.Boolean, default=False, nullable=False)
@@ -49,21 +58,124 @@ class Project(db.Model):
         db.DateTime(timezone=False), server_default=func.now(), nullable=False
     )
 
-    def parse(self) -> dict:
-        funders = []
-        total_funding_amount = 0
-        for funding in self.funding:
-            funders.append(funding.parse())
+    @staticmethod
+    def eager_options() -> tuple:
+        # Loader strategies for everything parse() touches, so a page of
+        # projects is fetched in a fixed number of queries instead of one
+        # round trip per relationship per row
+        from .funding import Funding
+
+        return (
+            joinedload(Project.creator),
+            selectinload(Project.funding).joinedload(Funding.funder),
+            selectinload(Project.mediators),
+            selectinload(Project.subjects),
+            selectinload(Project.deliverables),
+        )
+
+    @staticmethod
+    def summary_columns() -> dict:
+        # Columns a summary of the project can be selected from instead of
+        # loading the projects and their relationships. Counts are correlated
+        # subqueries, only computed when they are selected
+        from .submission import Submission
 
-            if funding.status == "submitted":
-                total_funding_amount += funding.amount
+        return {
+            "project_id": Project.project_identifier,
+            "name": Project.name,
+            "short_description": Project.short_description,
+            "days_to_complete": Project.days_to_complete,
+            "status": Project.status,
+            "total_funding_amount": Project.total_funding_amount,
+            "onchain_funding_amount": Project.onchain_funding_amount,
+            "funder_count": Project.funder_count,
+            "mediator_count": select(func.count())
+            .select_from(mediator_association_table)
+            .where(mediator_association_table.c.project_id == Project.id)
+            .scalar_subquery(),
+            "submission_count": select(func.count(Submission.id))
+            .where(Submission.project_id == Project.id)
+            .scalar_subquery(),
+        }
+
+    def lock(self):
+        # Locks the project row until the transaction ends, so concurrent
+        # fundings of the project update its totals one after the other
+        db.session.refresh(self, with_for_update=True)
+
+    def apply_funding(self, funding, previous_status: str = None):
+        # Updates the funding aggregates for `funding` moving from
+        # previous_status (None for a new funding) to its current status.
+        # The amounts are atomic increments, the funder count looks up the
+        # other fundings of this funder only, call lock first
+        from .funding import Funding, COUNTED_STATUSES
+
+        status = funding.status or "requested"
+        amount = funding.amount
+
+        def delta(counted_status: str) -> int:
+            return amount * (
+                (status == counted_status) - (previous_status == counted_status)
+            )
+
+        self.total_funding_amount = Project.total_funding_amount + delta("submitted")
+        self.onchain_funding_amount = Project.onchain_funding_amount + delta(
+            "onchain"
+        )
+
+        counted = status in COUNTED_STATUSES
+        if counted == (previous_status in COUNTED_STATUSES):
+            return
+
+        db.session.flush()
+
+        funder_counted = db.session.query(
+            Funding.query.filter(
+                Funding.project_id == self.id,
+                Funding.funder_id == funding.funder_id,
+                Funding.status.in_(COUNTED_STATUSES),
+                Funding.id != funding.id,
+            ).exists()
+        ).scalar()
+
+        if not funder_counted:
+            self.funder_count = Project.funder_count + (1 if counted else -1)
+
+    def refresh_funding_totals(self):
+        # Recomputes the aggregates from every funding of the project, for
+        # repairs. Writes go through apply_funding
+        from .funding import Funding
+
+        total_funding_amount, onchain_funding_amount, funder_count = (
+            db.session.query(
+                func.sum(case((Funding.status == "submitted", Funding.amount), else_=0)),
+                func.sum(case((Funding.status == "onchain", Funding.amount), else_=0)),
+                func.count(
+                    func.distinct(
+                        case(
+                            (
+                                Funding.status.in_(["submitted", "onchain"]),
+                                Funding.funder_id,
+                            )
+                        )
+                    )
+                ),
+            )
+            .filter(Funding.project_id == self.id)
+            .one()
+        )
+
+        self.total_funding_amount = total_funding_amount or 0
+        self.onchain_funding_amount = onchain_funding_amount or 0
+        self.funder_count = funder_count
 
+    def parse(self) -> dict:
         return {
             "project_id": self.project_identifier,
             "name": self.name,
             "creator": self.creator.parse(),
-            "funders": funders,
-            "total_funding_amount": total_funding_amount,
+            "funders": [funding.parse() for funding in self.funding],
+            "total_funding_amount": self.total_funding_amount or 0,
             "mediators": [mediator.parse() for mediator in self.mediators],
             "short_description": self.short_description,
             "long_description": self.long_description,
@@ -1,9 +1,12 @@
 from . import db
+from .types import UUIDString, str_uuid7
 
-from sqlalchemy.orm import relationship
-from sqlalchemy import ForeignKey, func
-from typing import List
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy import DDL, ForeignKey, event, func
+from dataclasses import dataclass
+from typing import List, Optional
 
+from lib.cache import TTLCache, MISSING
 from .user import User
 
 import datetime
@@ -21,12 +24,30 @@ sample_questions = {
 }
 
 
+@dataclass(frozen=True)
+class QuizDefinition:
+    # Parsed questions of a quiz version, shared between requests so they
+    # must never be mutated
+    questions: list
+    public_questions: list
+
+
+# Quiz definitions by (quiz_identifier, version). ORM updates bump the
+# version through version_id_col and the quiz_bump_version trigger bumps it
+# for any other update, so stale entries are never read again and age out
+quiz_definitions = TTLCache(max_size=1024, ttl=24 * 60 * 60)
+
+
 class Quiz(db.Model):
     __tablename__ = "quiz"
 
     id = db.Column(db.Integer, primary_key=True)
     quiz_identifier = db.Column(
-        db.String(64), default=lambda: str(uuid.uuid4()), nullable=False
+        UUIDString,
+        default=str_uuid7,
+        nullable=False,
+        unique=True,
+        index=True,
     )
 
     creator_id = db.Column(db.Integer, ForeignKey("user.id"))
@@ -37,14 +58,33 @@ class Quiz(db.Model):
 
     creator_name = db.Column(db.String(), nullable=False)
 
-    questions = db.Column(db.JSON, nullable=False)
+    # Deferred so loading a quiz doesn't decode its questions when the parsed
+    # definition is already cached
+    questions = deferred(db.Column(db.JSON, nullable=False))
 
     current_limit = db.Column(db.Integer, default=100, nullable=False)
 
+    version = db.Column(db.Integer, nullable=False)
+    __mapper_args__ = {"version_id_col": version}
+
     creation_date = db.Column(
         db.DateTime(timezone=False), server_default=func.now(), nullable=False
     )
 
+    def definition(self) -> QuizDefinition:
+        if self.version is None:
+            # Not flushed yet, so there is no version to cache it under
+            return Quiz.parse_definition(self.questions)
+
+        key = (self.quiz_identifier, self.version)
+
+        definition = quiz_definitions.get(key)
+        if definition is MISSING:
+            definition = Quiz.parse_definition(self.questions)
+            quiz_definitions.set(key, definition)
+
+        return definition
+
     def info(self):
         return {
             "quiz_id": self.quiz_identifier,
@@ -52,7 +92,7 @@ class Quiz(db.Model):
             "creator_stake_address": self.creator.stake_address
             if self.creator
             else None,
-            "questions": self.questions,
+            "questions": self.definition().questions,
             "creation_date": self.creation_date.strftime("%Y/%m/%d %H:%M:%S"),
         }
 
@@ -63,9 +103,7 @@ class Quiz(db.Model):
             "creator_stake_address": self.creator.stake_address
             if self.creator
             else None,
-            "questions": [
-                Quiz.public_question(question) for question in self.questions
-            ],
+            "questions": self.definition().public_questions,
             "current_limit": self.current_limit,
             "creation_date": self.creation_date.strftime("%Y/%m/%d %H:%M:%S"),
         }
@@ -74,6 +112,14 @@ class Quiz(db.Model):
     def find(quiz_id: str):
         return Quiz.query.filter(Quiz.quiz_identifier == quiz_id).first()
 
+    @staticmethod
+    def current_version(quiz_id: str) -> Optional[int]:
+        return (
+            Quiz.query.filter(Quiz.quiz_identifier == quiz_id)
+            .with_entities(Quiz.version)
+            .scalar()
+        )
+
     @staticmethod
     def created_by_user(user: User):
         return Quiz.query.filter(Quiz.creator_id == user.id).all()
@@ -96,6 +142,54 @@ class Quiz(db.Model):
             "answers": question["answers"],
         }
 
+    @staticmethod
+    def parse_definition(questions: List[dict]) -> QuizDefinition:
+        return QuizDefinition(
+            questions=questions,
+            public_questions=[Quiz.public_question(question) for question in questions],
+        )
+
+    @staticmethod
+    def bulk_create(quizzes: List[dict]) -> List[str]:
+        # Inserts already validated quizzes (creator_name, questions and an
+        # optional creator_stake_address) with one INSERT. Returns their
+        # identifiers in the same order
+        if not quizzes:
+            return []
+
+        creators = {
+            stake_address: id
+            for id, stake_address in User.query.filter(
+                User.stake_address.in_(
+                    {
+                        quiz["creator_stake_address"]
+                        for quiz in quizzes
+                        if quiz.get("creator_stake_address") is not None
+                    }
+                )
+            ).with_entities(User.id, User.stake_address)
+        }
+
+        quiz_ids = [str_uuid7() for _ in quizzes]
+
+        db.session.execute(
+            Quiz.__table__.insert().values(
+                [
+                    {
+                        "quiz_identifier": quiz_id,
+                        "creator_id": creators.get(quiz.get("creator_stake_address")),
+                        "creator_name": quiz["creator_name"],
+                        "questions": quiz["questions"],
+                        "version": 1,
+                    }
+                    for quiz_id, quiz in zip(quiz_ids, quizzes)
+                ]
+            )
+        )
+        db.session.commit()
+
+        return quiz_ids
+
     @staticmethod
     def sample(
         quiz_identifier: str = -1,
@@ -127,3 +221,42 @@ class Quiz(db.Model):
             ),
             creation_date=if_else(creation_date, datetime.datetime.utcnow()),
         )
+
+
+# Same trigger as migrations/2026_10_18_quiz_version.sql, for databases
+# created with create_all
+event.listen(
+    Quiz.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION quiz_bump_version() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.version = OLD.version THEN
+                NEW.version := OLD.version + 1;
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER quiz_bump_version
+        BEFORE UPDATE ON quiz
+        FOR EACH ROW EXECUTE FUNCTION quiz_bump_version();
+        """
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Quiz.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE TRIGGER quiz_bump_version
+        AFTER UPDATE ON quiz
+        FOR EACH ROW WHEN NEW.version = OLD.version
+        BEGIN
+            UPDATE quiz SET version = OLD.version + 1 WHERE id = NEW.id;
+        END
+        """
+    ).execute_if(dialect="sqlite"),
+)
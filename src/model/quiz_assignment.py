@@ -1,24 +1,31 @@
 from . import db
+from .types import UUIDString, str_uuid7
 
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey, func, and_
 
-from typing import List
+from typing import List, Tuple
 
 from .quiz import Quiz
 from .user import User
 
 import datetime
 import random
-import uuid
 
 
 class QuizAssignment(db.Model):
     __tablename__ = "quiz_assignment"
+    __table_args__ = (
+        db.Index("ix_quiz_assignment_quiz_id_assignee_id", "quiz_id", "assignee_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     quiz_assignment_identifier = db.Column(
-        db.String(64), default=lambda: str(uuid.uuid4()), nullable=False
+        UUIDString,
+        default=str_uuid7,
+        nullable=False,
+        unique=True,
+        index=True,
     )
 
     assignee_id = db.Column(db.Integer, ForeignKey("user.id"), nullable=False)
@@ -27,7 +34,9 @@ class QuizAssignment(db.Model):
     quiz_id = db.Column(db.Integer, ForeignKey("quiz.id"), nullable=False)
     quiz = relationship("Quiz", back_populates="assignments")
 
-    powerups = relationship("PowerUp", back_populates="quiz_assignment")
+    powerups = relationship(
+        "PowerUp", back_populates="quiz_assignment", order_by="PowerUp.id"
+    )
 
     # None means this assignment has ended
     current_question = db.Column(db.Integer, default=0)
@@ -57,7 +66,7 @@ class QuizAssignment(db.Model):
 
     def powerup_payload(self, powerup: str):
         if powerup == "get_hints":
-            hints = self.quiz.questions[self.current_question]["hints"]
+            hints = self.quiz.definition().questions[self.current_question]["hints"]
             return random.choice(hints)
         elif powerup == "get_percentage":
             percentage = {}
@@ -69,9 +78,7 @@ class QuizAssignment(db.Model):
             "quiz_id": self.quiz.quiz_identifier,
             "assignee_stake_address": self.assignee.stake_address,
             "creator_name": self.quiz.creator_name,
-            "questions": [
-                Quiz.public_question(question) for question in self.quiz.questions
-            ],
+            "questions": self.quiz.definition().public_questions,
             "current_limit": self.quiz.current_limit,
             "powerups": [powerup.info() for powerup in self.powerups],
             "current_question": self.current_question,
@@ -80,17 +87,18 @@ class QuizAssignment(db.Model):
             "creation_date": self.creation_date.strftime("%Y/%m/%d %H:%M:%S"),
         }
 
+    # State transitions only stage their changes, the caller commits them
+    # together with the attempt that caused them
+
     def lose_attempt(self):
         self.remaining_attempts -= 1
 
         db.session.add(self)
-        db.session.commit()
 
     def move_next_question(self):
         self.current_question += 1
 
         db.session.add(self)
-        db.session.commit()
 
     def complete_with_success(self):
         self.current_question = None
@@ -98,7 +106,6 @@ class QuizAssignment(db.Model):
         self.completed_date = datetime.datetime.utcnow()
 
         db.session.add(self)
-        db.session.commit()
 
     def complete_with_failure(self):
         self.remaining_attempts -= 1
@@ -107,7 +114,6 @@ class QuizAssignment(db.Model):
         self.completed_date = datetime.datetime.utcnow()
 
         db.session.add(self)
-        db.session.commit()
 
     @staticmethod
     def find(quiz_id: str, assignee_stake_address: str):
@@ -155,6 +161,97 @@ class QuizAssignment(db.Model):
 
         return quiz_assignment
 
+    @staticmethod
+    def bulk_find_or_create(assignments: List[Tuple[str, str]]) -> List[dict]:
+        # Set based find_or_create for many (quiz_id, assignee_stake_address)
+        # pairs. Returns one result per pair, in the same order
+        #
+        # (quiz, assignee) isn't unique, so the quiz rows are locked until the
+        # commit: overlapping calls, like a retry of a request that is still
+        # running, wait and then find the rows the other one created. In id
+        # order so calls with different quizzes can't deadlock
+        quizzes = {
+            quiz_identifier: id
+            for id, quiz_identifier in Quiz.query.filter(
+                Quiz.quiz_identifier.in_({quiz_id for quiz_id, _ in assignments})
+            )
+            .order_by(Quiz.id)
+            .with_entities(Quiz.id, Quiz.quiz_identifier)
+            .with_for_update()
+        }
+        users = {
+            stake_address: id
+            for id, stake_address in User.query.filter(
+                User.stake_address.in_(
+                    {stake_address for _, stake_address in assignments}
+                )
+            ).with_entities(User.id, User.stake_address)
+        }
+
+        existing = {}
+        if quizzes and users:
+            for identifier, quiz_id, assignee_id in (
+                QuizAssignment.query.filter(
+                    QuizAssignment.quiz_id.in_(quizzes.values()),
+                    QuizAssignment.assignee_id.in_(users.values()),
+                )
+                .order_by(QuizAssignment.id)
+                .with_entities(
+                    QuizAssignment.quiz_assignment_identifier,
+                    QuizAssignment.quiz_id,
+                    QuizAssignment.assignee_id,
+                )
+            ):
+                existing.setdefault((quiz_id, assignee_id), identifier)
+
+        results = []
+        created = {}
+        for quiz_id, stake_address in assignments:
+            result = {
+                "quiz_id": quiz_id,
+                "user_stake_address": stake_address,
+                "quiz_assignment_id": None,
+            }
+
+            if quiz_id not in quizzes:
+                result["status"] = "quiz-not-found"
+            elif stake_address not in users:
+                result["status"] = "user-not-found"
+            else:
+                key = (quizzes[quiz_id], users[stake_address])
+
+                if key in existing:
+                    result["status"] = "existing"
+                    result["quiz_assignment_id"] = existing[key]
+                else:
+                    if key not in created:
+                        created[key] = str_uuid7()
+
+                    result["status"] = "created"
+                    result["quiz_assignment_id"] = created[key]
+
+            results.append(result)
+
+        if created:
+            # Only the keys are given, the other columns get the same column
+            # defaults find_or_create relies on
+            db.session.execute(
+                QuizAssignment.__table__.insert().values(
+                    [
+                        {
+                            "quiz_assignment_identifier": identifier,
+                            "quiz_id": quiz_id,
+                            "assignee_id": assignee_id,
+                        }
+                        for (quiz_id, assignee_id), identifier in created.items()
+                    ]
+                )
+            )
+
+        db.session.commit()
+
+        return results
+
     @staticmethod
     def sample(
         assignee: User = -1,
@@ -1,7 +1,7 @@
 import datetime
-import uuid
 
 from . import db
+from .types import UUIDString, str_uuid7
 
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey, func
@@ -12,7 +12,11 @@ class Review(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     review_identifier = db.Column(
-        db.String(64), default=lambda: str(uuid.uuid4()), nullable=False
+        UUIDString,
+        default=str_uuid7,
+        nullable=False,
+        unique=True,
+        index=True,
     )
 
     reviewer_id = db.Column(db.Integer, ForeignKey("user.id"), nullable=False)
@@ -1,6 +1,5 @@
-import uuid
-
 from . import db
+from .types import UUIDString, str_uuid7
 
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey, func
@@ -11,7 +10,11 @@ class Submission(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     submission_identifier = db.Column(
-        db.String(64), default=lambda: str(uuid.uuid4()), nullable=False
+        UUIDString,
+        default=str_uuid7,
+        nullable=False,
+        unique=True,
+        index=True,
     )
 
     project_id = db.Column(db.Integer, ForeignKey("project.id"), nullable=False)
@@ -0,0 +1,86 @@
+from sqlalchemy.types import TypeDecorator, String
+from sqlalchemy.dialects import postgresql
+
+import functools
+import time
+import uuid
+import os
+
+
+def uuid7() -> uuid.UUID:
+    # Time ordered UUID (version 7 layout): 48 bits of unix time in
+    # milliseconds followed by random bits, so new rows are appended to the
+    # end of identifier indexes instead of landing on random pages
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= ((rand >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand & ((1 << 62) - 1)
+
+    return uuid.UUID(int=value)
+
+
+def str_uuid7() -> str:
+    return str(uuid7())
+
+
+def canonical_uuid(value: str) -> str:
+    # Lowercase hyphenated form of a UUID, the one UUIDString reads back. On
+    # Postgres lookups match any spelling of a UUID, so identifiers from
+    # requests are normalised before they are used as dict or cache keys.
+    # Values that aren't UUIDs (rows from before the migration) are kept
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, TypeError, AttributeError):
+        return value
+
+
+def canonical_uuids(*arguments: str):
+    # Handler decorator normalising the given identifier arguments with
+    # canonical_uuid
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            for argument in arguments:
+                if argument in kwargs:
+                    kwargs[argument] = canonical_uuid(kwargs[argument])
+
+            return handler(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class UUIDString(TypeDecorator):
+    # UUID exposed as a string. Stored as a native 16 byte uuid on Postgres and
+    # as a plain string on other databases (SQLite in the tests)
+
+    impl = String(64)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+
+        return dialect.type_descriptor(String(64))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "postgresql":
+            return value
+
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            # Not a UUID, so it can't match any row - compare against NULL
+            # instead of failing the whole query
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        return str(value)
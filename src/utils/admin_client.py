@@ -0,0 +1,263 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional
+
+import requests
+import threading
+import hashlib
+import logging
+import json
+import time
+import os
+
+
+API_URL = os.environ.get("ATHENA_API_URL", "https://api.athenacrowdfunding.com")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+@dataclass(frozen=True)
+class Job:
+    # `key` identifies the job in the checkpoint file, so it must be stable
+    # between runs of the same script. `idempotent` defaults to the method's,
+    # set it for POST endpoints that can safely be repeated
+    key: str
+    method: str
+    path: str
+    body: Any = None
+    idempotent: Optional[bool] = None
+
+
+@dataclass
+class Summary:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def fail(self, key: str, error: str):
+        self.failed += 1
+        self.errors.append(error)
+        logging.error(f"Job {key} failed: {error}")
+
+    def throughput(self) -> float:
+        return (self.succeeded + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.succeeded}/{self.total} succeeded, {self.failed} failed, "
+            f"{self.skipped} skipped in {self.elapsed:.2f}s "
+            f"({self.throughput():.1f} requests/s)"
+        )
+
+
+class Checkpoint:
+    # Keys of the jobs that already succeeded, one per line. Lets a script
+    # that was interrupted or had failures be run again without repeating
+    # the requests that went through
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = set()
+
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                self.done = {line.rstrip("\n") for line in file if line.strip()}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def mark(self, key: str):
+        with self.lock:
+            self.done.add(key)
+
+            if self.path is not None:
+                with open(self.path, "a") as file:
+                    file.write(f"{key}\n")
+
+
+class RequestFailed(Exception):
+    pass
+
+
+class AdminClient:
+    def __init__(
+        self,
+        base_url: str = API_URL,
+        workers: int = 8,
+        retries: int = 5,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        checkpoint: Optional[str] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.checkpoint = Checkpoint(checkpoint)
+
+        # One connection per worker, reused for every request
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=workers
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        # Sends the request, retrying connection errors, timeouts, 429 and 5xx
+        # with exponential backoff. Returns the json response or raises
+        # RequestFailed, also for responses that aren't JSON and every other
+        # requests error
+        #
+        # A non idempotent request may have been handled when it times out or
+        # gets a 5xx, so it is only retried when it never reached the server
+        # or was refused with 429
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2**attempt
+
+            try:
+                response = self.session.request(
+                    method, f"{self.base_url}{path}", json=body, timeout=self.timeout
+                )
+            except requests.ConnectTimeout as e:
+                # The connection was never established
+                error = str(e)
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                error = str(e)
+                if not idempotent:
+                    break
+            except requests.RequestException as e:
+                # Invalid URLs, redirect loops... repeating won't help
+                raise RequestFailed(f"{method} {path}: {e}") from e
+            else:
+                if response.status_code < 400:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        raise RequestFailed(
+                            f"{method} {path}: {response.status_code} response "
+                            f"isn't JSON: {response.text.strip()[:200]}"
+                        ) from e
+
+                error = f"{response.status_code} {response.text.strip()}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+
+                if response.status_code != 429 and not idempotent:
+                    break
+
+                if "Retry-After" in response.headers:
+                    try:
+                        delay = float(response.headers["Retry-After"])
+                    except ValueError:
+                        pass
+
+            if attempt < self.retries:
+                logging.debug(f"{method} {path} failed ({error}), retrying in {delay}s")
+                time.sleep(delay)
+
+        raise RequestFailed(f"{method} {path}: {error}")
+
+    def run(
+        self, jobs: Iterable[Job], on_result=None, summary: Optional[Summary] = None
+    ) -> Summary:
+        # Runs the jobs on at most `workers` threads. Failures are collected
+        # instead of stopping the run; jobs already in the checkpoint are
+        # skipped. `on_result(job, response)` is called for every success, a
+        # job only counts as done once it returned, so if it raises the job
+        # fails and runs again next time. Pass `summary` to also count
+        # failures of the job generator in it
+
+        summary = summary if summary is not None else Summary()
+        start = time.monotonic()
+
+        def run_job(job: Job):
+            return self.request(job.method, job.path, job.body, job.idempotent)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+
+            def collect(futures):
+                for future in futures:
+                    job = pending.pop(future)
+                    try:
+                        response = future.result()
+                        if on_result is not None:
+                            on_result(job, response)
+                    except RequestFailed as e:
+                        summary.fail(job.key, str(e))
+                    except Exception as e:
+                        logging.exception(f"Job {job.key} raised")
+                        summary.fail(
+                            job.key, f"{job.method} {job.path}: {type(e).__name__}: {e}"
+                        )
+                    else:
+                        self.checkpoint.mark(job.key)
+                        summary.succeeded += 1
+
+            for job in jobs:
+                summary.total += 1
+
+                if job.key in self.checkpoint:
+                    summary.skipped += 1
+                    continue
+
+                # Only keep a bounded number of jobs queued, so huge job
+                # generators are not consumed up front
+                if len(pending) >= 2 * self.workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                pending[executor.submit(run_job, job)] = job
+
+            done, _ = wait(pending)
+            collect(done)
+
+        summary.elapsed = time.monotonic() - start
+
+        return summary
+
+
+def chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def content_key(prefix: str, items: List[Any]) -> str:
+    # Checkpoint key of a batch from its content rather than its position,
+    # so a batch only counts as done if exactly these items were sent
+    digest = hashlib.sha256(
+        json.dumps(items, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+    return f"{prefix}|{digest[:32]}"
+
+
+def checkpoint_path(script: str) -> str:
+    # Checkpoint next to the script, e.g. src/utils/.quiz_users.checkpoint
+    name = os.path.splitext(os.path.basename(script))[0]
+
+    return os.environ.get(
+        "ATHENA_CHECKPOINT",
+        os.path.join(os.path.dirname(os.path.abspath(script)), f".{name}.checkpoint"),
+    )
@@ -1,8 +1,6 @@
-import requests
-import csv
-
+from admin_client import AdminClient, Job, checkpoint_path, chunks, content_key
 
-endpoint = "https://api.athenacrowdfunding.com/quiz/powerup"
+import csv
 
 
 quiz_assignments = []
@@ -11,24 +9,46 @@ with open("src/utils/quiz_assignment.csv") as csvfile:
     for row in reader:
         quiz_assignments.append(row[1])
 
-for quiz_assignment in quiz_assignments[1:]:
-    print(f"Assigning powerups for {quiz_assignment}")
+print(f"Assigning powerups for {len(quiz_assignments[1:])} quiz assignments")
 
-    response = requests.post(f"{endpoint}/{quiz_assignment}/create/get_hints", json={})
-    if response.status_code != 200:
-        print(response.json())
-        raise Exception(f"Failed to assign get_hints for {quiz_assignment}")
-    
-    response = requests.post(
-        f"{endpoint}/{quiz_assignment}/create/skip_question", json={}
-    )
-    if response.status_code != 200:
-        print(response.json())
-        raise Exception(f"Failed to assign skip_question for {quiz_assignment}")
-    
-    response = requests.post(
-        f"{endpoint}/{quiz_assignment}/create/eliminate_half", json={}
+created = 0
+skipped = []
+
+
+def report(job, response):
+    # Assignments that don't exist or aren't in progress get no powerups and
+    # are left out of the response
+    global created
+
+    created += response["created"]
+    skipped.extend(
+        set(job.body["quiz_assignment_ids"]) - set(response["quiz_assignment_ids"])
     )
-    if response.status_code != 200:
-        print(response.json())
-        raise Exception(f"Failed to assign eliminate_half for {quiz_assignment}")
+
+
+client = AdminClient(checkpoint=checkpoint_path(__file__))
+summary = client.run(
+    (
+        Job(
+            content_key("powerups", batch),
+            "POST",
+            "/quiz/powerup/bulk",
+            {
+                "quiz_assignment_ids": batch,
+                "powerups": ["get_hints", "skip_question", "eliminate_half"],
+            },
+            # Existing powerups are skipped, repeating a batch is safe
+            idempotent=True,
+        )
+        for batch in chunks(quiz_assignments[1:], 500)
+    ),
+    on_result=report,
+)
+
+print(f"Created {created} powerups")
+if skipped:
+    print(f"Skipped {len(skipped)} quiz assignments not in progress or not found:")
+    for quiz_assignment_id in sorted(skipped):
+        print(f"  {quiz_assignment_id}")
+
+print(summary)
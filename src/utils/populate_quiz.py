@@ -1,8 +1,8 @@
 import csv
 import json
-import requests
 
 from typing import List
+from admin_client import AdminClient, Job, Summary, checkpoint_path
 
 # def parse_option(options: List[str]) -> List[str]:
 #     letter = {
@@ -92,39 +92,59 @@ from typing import List
 # with open("src/utils/quiz.json", "w") as file:
 #     file.write(json.dumps(questions))
 
+def quiz_body(quiz: dict) -> dict:
+    body = {
+        "creator_name": quiz["name"],
+        "questions": []
+    }
+    for question in [quiz[f"question_{i+1}"] for i in range(0, 10)]:
+        if "options" in question:
+            body["questions"].append({
+                "question": question["question"],
+                "answers": question["options"],
+                "right_answer": int(question["answer"]),
+                "hints": [question["hint"]],
+            })
+        else:
+            if question["answer"].lower() != "true" and question["answer"].lower() != "false":
+                raise ValueError(f"Invalid answer for {question['question']} - {question['answer']}")
+
+            body["questions"].append({
+                "question": question["question"],
+                "answers": ["a) True", "b) False"],
+                "right_answer": 0 if question["answer"].lower() == "true" else 1,
+                "hints": [question["hint"]],
+            })
+
+    return body
+
+
 with open("src/utils/quiz.json", "r") as file:
     quizes = json.loads(file.read())
 
+summary = Summary()
+
+
+def jobs():
+    # A malformed quiz counts as a failure instead of stopping the run
     for quiz in quizes:
-        print(f"Posting quiz for {quiz['name']}")
-
-        body = {
-            "creator_name": quiz["name"],
-            "questions": []
-        }
-        for question in [quiz[f"question_{i+1}"] for i in range(0, 10)]:
-            if "options" in question:
-                body["questions"].append({
-                    "question": question["question"],
-                    "answers": question["options"],
-                    "right_answer": int(question["answer"]),
-                    "hints": [question["hint"]],
-                })
-            else:
-                if question["answer"].lower() != "true" and question["answer"].lower() != "false":
-                    raise Exception(f"Invalid answer for {question['question']} - {question['answer']}")
-                
-                body["questions"].append({
-                    "question": question["question"],
-                    "answers": ["a) True", "b) False"],
-                    "right_answer": 0 if question["answer"].lower() == "true" else 1,
-                    "hints": [question["hint"]],
-                })
-
-        response = requests.post(
-            "https://api.athenacrowdfunding.com/quiz/create",
-            json=body
-        )
-
-        print(response.status_code)
-        print(response.json())
+        key = f"{quiz.get('timestamp')}|{quiz.get('name')}"
+
+        try:
+            body = quiz_body(quiz)
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            summary.total += 1
+            summary.fail(key, f"Invalid quiz: {e!r}")
+            continue
+
+        yield Job(key, "POST", "/quiz/create", body)
+
+
+client = AdminClient(checkpoint=checkpoint_path(__file__))
+summary = client.run(
+    jobs(),
+    on_result=lambda job, response: print(f"Posted quiz {job.key}: {response}"),
+    summary=summary,
+)
+
+print(summary)
@@ -1,6 +1,7 @@
 from typing import List
+from collections import Counter
+from admin_client import AdminClient, Job, checkpoint_path, chunks, content_key
 
-import requests
 import copy
 import csv
 
@@ -38,13 +39,42 @@ with open("src/utils/quiz.csv") as csvfile:
         quizes.append(row[1])
 
 result = create_list(users[1:], quizes[1:])
-for user, quiz in result.items():
-    print(f"Assignig {user} to {quiz}")
 
-    response = requests.post(
-        "https://api.athenacrowdfunding.com/quiz/assign",
-        json={"quiz_id": quiz, "user_stake_address": user},
-    )
+assignments = [
+    {"quiz_id": quiz, "user_stake_address": user} for user, quiz in result.items()
+]
 
-    print(response.status_code)
-    print(response.json())
+statuses = Counter()
+
+
+def report(job, response):
+    # Every pair gets a result, quizzes or users that don't exist are only
+    # reported there
+    for result in response["results"]:
+        statuses[result["status"]] += 1
+
+        if result["status"] not in ("created", "existing"):
+            print(
+                f"Not assigned {result['quiz_id']} to "
+                f"{result['user_stake_address']}: {result['status']}"
+            )
+
+
+client = AdminClient(checkpoint=checkpoint_path(__file__))
+summary = client.run(
+    # Assignments are found or created, repeating a batch is safe
+    (
+        Job(
+            content_key("assign", batch),
+            "POST",
+            "/quiz/assign/bulk",
+            {"assignments": batch},
+            idempotent=True,
+        )
+        for batch in chunks(assignments, 500)
+    ),
+    on_result=report,
+)
+
+print(", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+print(summary)
@@ -9,6 +9,8 @@ def api():
     sys.path.append("src")
 
     from model import db
+    from model.quiz import quiz_definitions
+    from lib import json_provider, rate_limit, response_cache
 
     os.environ = {
         **os.environ,
@@ -17,6 +19,7 @@ def api():
         "NETWORK_MODE": "testnet",
         "SCRIPT_PATH": "./script/script.plutus",
         "FUNDING_ASSET": "e77c6c0681f310334a286275645deb8df4f57a50bd8c930643e75c117374616b65",
+        "SESSION_SECRET": "<session_secret_of_32_characters>",
     }
 
     options = {"swagger_ui": False}
@@ -25,6 +28,7 @@ def api():
     )
 
     app.add_api("openapi-spec.yml", validate_responses=True)
+    json_provider.install()
 
     app = app.app
 
@@ -39,4 +43,8 @@ def api():
     with app.test_client() as c:
         yield (c, app)
 
+    quiz_definitions.clear()
+    rate_limit.get_rate_limiter().clear()
+    response_cache.response_cache.clear()
+
     sys.path.remove("src")
@@ -0,0 +1,206 @@
+import threading
+import sys
+
+import pytest
+
+from flask import Flask, request
+from werkzeug.serving import make_server
+
+
+@pytest.fixture
+def server():
+    app = Flask(__name__)
+    calls = {}
+
+    @app.route("/echo/<key>", methods=["POST"])
+    def echo(key):
+        calls[key] = calls.get(key, 0) + 1
+
+        # Flaky endpoints, fail the first two times
+        if key.startswith("flaky") and calls[key] <= 2:
+            return {"message": "unavailable"}, 503
+
+        if key == "throttled" and calls[key] <= 2:
+            return {"message": "too many requests"}, 429, {"Retry-After": "0"}
+
+        if key == "broken":
+            return {"message": "bad request"}, 400
+
+        if key == "not_json":
+            return "<html>maintenance</html>", 200, {"Content-Type": "text/html"}
+
+        return {"key": key, "body": request.get_json(silent=True)}
+
+    http_server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=http_server.serve_forever)
+    thread.start()
+
+    yield f"http://127.0.0.1:{http_server.server_port}", calls
+
+    http_server.shutdown()
+    thread.join()
+
+
+def test_admin_client(server, tmp_path):
+    sys.path.append("src/utils")
+
+    from admin_client import AdminClient, Job
+
+    url, calls = server
+    checkpoint = str(tmp_path / "checkpoint")
+
+    jobs = [Job(f"job_{i}", "POST", f"/echo/job_{i}", {"i": i}) for i in range(20)]
+    jobs += [
+        Job("flaky", "POST", "/echo/flaky", idempotent=True),
+        Job("flaky_create", "POST", "/echo/flaky_create"),
+        Job("throttled", "POST", "/echo/throttled"),
+        Job("broken", "POST", "/echo/broken"),
+    ]
+
+    client = AdminClient(url, workers=4, backoff=0.01, checkpoint=checkpoint)
+
+    results = {}
+    summary = client.run(jobs, lambda job, response: results.update({job.key: response}))
+
+    assert summary.total == 24
+    assert summary.succeeded == 22
+    assert summary.failed == 2
+    assert summary.skipped == 0
+    assert summary.throughput() > 0
+    assert sorted(summary.errors)[0].startswith("POST /echo/broken: 400")
+
+    assert results["job_3"] == {"key": "job_3", "body": {"i": 3}}
+    assert calls["flaky"] == 3
+    # A non idempotent request that failed on the server may have been
+    # handled, it is only retried when it was refused with 429
+    assert calls["flaky_create"] == 1
+    assert calls["throttled"] == 3
+    # Client errors are not retried
+    assert calls["broken"] == 1
+
+    # Running again only retries the job that failed
+    summary = AdminClient(url, workers=4, backoff=0.01, checkpoint=checkpoint).run(
+        jobs
+    )
+
+    assert summary.skipped == 22
+    assert summary.failed == 2
+    assert calls["job_0"] == 1
+    assert calls["flaky_create"] == 2
+    assert calls["broken"] == 2
+
+    sys.path.remove("src/utils")
+
+
+def test_admin_client_summary(server):
+    sys.path.append("src/utils")
+
+    from admin_client import AdminClient, Job, Summary
+
+    url, calls = server
+
+    # Failures found while generating the jobs count in the same summary
+    summary = Summary()
+
+    def jobs():
+        for i in range(3):
+            if i == 1:
+                summary.total += 1
+                summary.fail(f"job_{i}", "Invalid job")
+                continue
+
+            yield Job(f"summary_{i}", "POST", f"/echo/summary_{i}")
+
+    assert AdminClient(url, workers=2).run(jobs(), summary=summary) is summary
+
+    assert summary.total == 3
+    assert summary.succeeded == 2
+    assert summary.failed == 1
+    assert summary.errors == ["Invalid job"]
+
+    sys.path.remove("src/utils")
+
+
+def test_admin_client_errors(server, monkeypatch, tmp_path):
+    sys.path.append("src/utils")
+
+    import requests
+
+    from admin_client import AdminClient, Job
+
+    url, calls = server
+    checkpoint = str(tmp_path / "checkpoint")
+
+    client = AdminClient(url, workers=2, backoff=0.01, checkpoint=checkpoint)
+
+    # Errors of the requests, or of handling their responses, fail the job
+    # instead of stopping the run
+    def on_result(job, response):
+        if job.key == "bad_result":
+            raise KeyError("created")
+
+    summary = client.run(
+        [
+            Job("not_json", "POST", "/echo/not_json"),
+            Job("bad_result", "POST", "/echo/bad_result"),
+            Job("ok", "POST", "/echo/ok"),
+        ],
+        on_result,
+    )
+
+    assert summary.succeeded == 1
+    assert summary.failed == 2
+    assert sorted(summary.errors) == [
+        "POST /echo/bad_result: KeyError: 'created'",
+        "POST /echo/not_json: 200 response isn't JSON: <html>maintenance</html>",
+    ]
+
+    # A job whose result couldn't be handled runs again
+    assert "bad_result" not in client.checkpoint
+    assert "ok" in client.checkpoint
+
+    request = client.session.request
+
+    def failing_request(method, url, **kwargs):
+        if url.endswith("/chunked"):
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+        if url.endswith("/redirects"):
+            raise requests.TooManyRedirects("Exceeded 30 redirects")
+
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(client.session, "request", failing_request)
+
+    summary = client.run(
+        [
+            Job("chunked", "GET", "/chunked"),
+            Job("redirects", "GET", "/redirects"),
+            Job("ok_again", "POST", "/echo/ok_again"),
+        ]
+    )
+
+    assert summary.succeeded == 1
+    assert sorted(summary.errors) == [
+        "GET /chunked: Connection broken",
+        "GET /redirects: Exceeded 30 redirects",
+    ]
+
+    sys.path.remove("src/utils")
+
+
+def test_content_key():
+    sys.path.append("src/utils")
+
+    from admin_client import chunks, content_key
+
+    rows = [f"row_{i}" for i in range(10)]
+    keys = [content_key("assign", batch) for batch in chunks(rows, 4)]
+
+    assert keys == [content_key("assign", batch) for batch in chunks(rows, 4)]
+
+    # A row added at the start shifts every batch, none of them is done
+    shifted = [content_key("assign", batch) for batch in chunks(["new"] + rows, 4)]
+
+    assert not set(keys) & set(shifted)
+
+    sys.path.remove("src/utils")
@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+
+
+def test_get_provider():
+    sys.path.append("src")
+
+    import athena_providers
+
+    assert set(athena_providers.providers) >= {"blockfrost", "ogmios", "mock"}
+    assert athena_providers.get_provider("ogmios").envs == ["OGMIOS_URL", "KUPO_URL"]
+
+    with pytest.raises(ValueError):
+        athena_providers.get_provider("unknown")
+
+
+def test_mock_chain_context(monkeypatch):
+    sys.path.append("src")
+
+    import pycardano as pyc
+
+    from lib import script_tools
+    from athena_providers.mock import MockChainContext
+
+    monkeypatch.setattr(
+        "os.environ",
+        {
+            "NETWORK_MODE": "testnet",
+            "SCRIPT_PATH": "./script/script.plutus",
+            "MEDIATOR_POLICY": "00" * 28,
+        },
+    )
+    monkeypatch.setattr("lib.script_tools.provider_name", lambda: "mock")
+
+    script_tools.reset_cardano_handler()
+    handler = script_tools.get_cardano_handler()
+    script_tools.reset_cardano_handler()
+
+    chain_context = handler["chain_context"]
+    assert isinstance(chain_context, MockChainContext)
+    assert chain_context.network == pyc.Network.TESTNET
+
+    funder = pyc.Address(
+        pyc.PaymentSigningKey.from_cbor(
+            "5820ac29084c8ceca56b02c4118e76c1845c40b5eb810444a069e8edf2f5280ee875"
+        )
+        .to_verification_key()
+        .hash(),
+        network=pyc.Network.TESTNET,
+    )
+
+    # Same UTxOs for the same address, in every context
+    utxos = chain_context.utxos(str(funder))
+    assert utxos == MockChainContext().utxos(str(funder))
+    assert len(utxos) == 5
+
+    transaction = script_tools.create_transaction_fund_project(
+        chain_context,
+        funder,
+        utxos[:2],
+        pyc.Value(10_000_000),
+        handler["script"],
+        bytes.fromhex(handler["mediator_policy"]),
+        funder,
+        1_700_000_000,
+    )
+
+    transaction_id = chain_context.submit_tx(transaction.to_cbor())
+    assert transaction_id == str(transaction.transaction_body.id)
+
+    # Inputs are spent and outputs become UTxOs
+    remaining = chain_context.utxos(str(funder))
+    assert not any(utxo in remaining for utxo in utxos[:2])
+    assert any(str(utxo.input.transaction_id) == transaction_id for utxo in remaining)
+
+    script_address = script_tools.compile_script(handler["script"]).address(
+        pyc.Network.TESTNET
+    )
+    assert chain_context.utxos(str(script_address))[0].output.amount == pyc.Value(
+        10_000_000
+    )
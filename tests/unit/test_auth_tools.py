@@ -0,0 +1,169 @@
+import sys
+import datetime
+import time
+
+import pytest
+
+
+def test_validate_signature_cache(monkeypatch):
+    sys.path.append("src")
+
+    from lib import auth_tools
+
+    auth_tools.signature_cache.clear()
+
+    timestamp = int(datetime.datetime.utcnow().timestamp())
+
+    calls = []
+
+    def signature_message(signature, address):
+        calls.append((signature, address))
+
+        if signature == "invalid_signature":
+            return None
+
+        return f"Athena MIUR | {timestamp}"
+
+    monkeypatch.setattr("lib.cardano_tools.signature_message", signature_message)
+
+    assert auth_tools.validate_signature("signature", "stake_test123") is True
+    assert auth_tools.validate_signature("signature", "stake_test123") is True
+    assert len(calls) == 1
+
+    # Different address or signature format are verified separately
+    assert auth_tools.validate_signature("signature", "stake_test456") is True
+    assert (
+        auth_tools.validate_signature(
+            {"signature": "signature", "key": "key"}, "stake_test123"
+        )
+        is True
+    )
+    assert len(calls) == 3
+
+    # Invalid signatures are cached as well
+    assert auth_tools.validate_signature("invalid_signature", "stake_test123") is False
+    assert auth_tools.validate_signature("invalid_signature", "stake_test123") is False
+    assert len(calls) == 4
+
+    # Cached messages are still checked against the expiration window
+    class NewDate(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.datetime.utcfromtimestamp(
+                timestamp + auth_tools.EXPIRE_SECONDS + 1
+            )
+
+    monkeypatch.setattr("lib.auth_tools.datetime.datetime", NewDate)
+
+    assert auth_tools.validate_signature("signature", "stake_test123") is False
+    assert len(calls) == 4
+
+    auth_tools.signature_cache.clear()
+
+
+def test_ttl_cache(monkeypatch):
+    sys.path.append("src")
+
+    from lib.cache import TTLCache, MISSING
+
+    now = [0.0]
+    monkeypatch.setattr("lib.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(max_size=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") is MISSING
+
+    # Least recently used entry is evicted
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+    now[0] += 10
+    assert cache.get("a") is MISSING
+    assert cache.get("c", "default") == "default"
+
+
+SECRET = "a" * 32
+OTHER_SECRET = "b" * 32
+
+
+def test_session_token(monkeypatch):
+    sys.path.append("src")
+
+    from lib import auth_tools
+
+    monkeypatch.setattr("os.environ", {"SESSION_SECRET": SECRET})
+
+    now = int(time.time())
+
+    token = auth_tools.issue_session_token("stake_test123", now + 60)
+
+    assert auth_tools.validate_session_token(token, "stake_test123") is True
+    assert auth_tools.validate_session_token(token, "stake_test456") is False
+    assert auth_tools.validate_session_token("foobar", "stake_test123") is False
+
+    # Tampering with the payload invalidates the token
+    payload, mac = token.split(".")
+    forged_payload = auth_tools.base64.urlsafe_b64encode(
+        f"stake_test456|{now + 60}".encode("utf-8")
+    ).decode("utf-8")
+
+    assert (
+        auth_tools.validate_session_token(f"{forged_payload}.{mac}", "stake_test456")
+        is False
+    )
+
+    # Tokens signed with another secret are rejected
+    monkeypatch.setattr("os.environ", {"SESSION_SECRET": OTHER_SECRET})
+    assert auth_tools.validate_session_token(token, "stake_test123") is False
+
+    monkeypatch.setattr("os.environ", {"SESSION_SECRET": SECRET})
+
+    expired_token = auth_tools.issue_session_token("stake_test123", now - 1)
+    assert auth_tools.validate_session_token(expired_token, "stake_test123") is False
+
+    # Authorization header takes precedence over the signature
+    monkeypatch.setattr("lib.auth_tools.validate_signature", lambda *_: False)
+
+    assert auth_tools.authenticate(None, "stake_test123", f"Bearer {token}") is True
+    assert auth_tools.authenticate("signature", "stake_test123") is False
+    assert auth_tools.authenticate(None, "stake_test123") is False
+
+
+def test_session_secret(monkeypatch):
+    sys.path.append("src")
+
+    from lib import auth_tools
+
+    monkeypatch.setattr("os.environ", {"SESSION_SECRET": SECRET})
+    token = auth_tools.issue_session_token("stake_test123")
+
+    # Session tokens are optional, without a usable secret they are neither
+    # issued nor accepted, and the app only warns about it at startup
+    for environment in [{}, {"SESSION_SECRET": ""}, {"SESSION_SECRET": "secret"}]:
+        monkeypatch.setattr("os.environ", environment)
+
+        assert auth_tools.sessions_enabled() is False
+        auth_tools.check_session_secret()
+
+        with pytest.raises(ValueError):
+            auth_tools.issue_session_token("stake_test123")
+
+        assert auth_tools.validate_session_token(token, "stake_test123") is False
+        assert auth_tools.authenticate(None, "stake_test123", f"Bearer {token}") is False
+
+    monkeypatch.setattr("os.environ", {"SESSION_SECRET": SECRET})
+    assert auth_tools.sessions_enabled() is True
+
+    # Expiration dates are Unix timestamps, whatever the host timezone is
+    token = auth_tools.issue_session_token("stake_test123")
+    payload = auth_tools.base64.urlsafe_b64decode(token.split(".")[0]).decode("utf-8")
+    expires_at = int(payload.rsplit("|", 1)[1])
+
+    assert abs(expires_at - time.time() - auth_tools.SESSION_EXPIRE_SECONDS) < 5
@@ -0,0 +1,53 @@
+import datetime
+import decimal
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_providers_encode_alike(name):
+    sys.path.append("src")
+
+    from lib import json_provider
+
+    if name not in json_provider.providers:
+        pytest.skip(f"{name} is not installed")
+
+    jsonifier = json_provider.get_jsonifier(name)
+
+    data = {
+        "project_id": "a7420038-3a6d-48e0-8960-cdf839e46f4e",
+        "funders": [{"amount": 10_000_000, "status": "onchain"}],
+        "ratio": 0.5,
+        "name": "Projeto é ótimo",
+        "creation_date": datetime.datetime(2022, 6, 24, 12, 0, 0),
+        "deadline": datetime.date(2022, 7, 9),
+        "price": decimal.Decimal("1.5"),
+        "empty": None,
+    }
+
+    encoded = jsonifier.dumps(data)
+
+    assert encoded == json_provider.stdlib_dumps(data)
+    assert encoded.endswith("\n")
+    assert jsonifier.loads(encoded)["creation_date"] == "2022-06-24T12:00:00Z"
+    assert jsonifier.loads(encoded.encode("utf-8"))["name"] == "Projeto é ótimo"
+
+    # Past 64 bits orjson gives up, the stdlib encoder takes over
+    assert jsonifier.loads(jsonifier.dumps({"amount": 2**70})) == {"amount": 2**70}
+
+    # Like connexion, bodies that aren't JSON come back as they are
+    assert jsonifier.loads(b"not json") == "not json"
+
+
+def test_get_jsonifier(monkeypatch):
+    sys.path.append("src")
+
+    from lib import json_provider
+
+    monkeypatch.setenv("JSON_PROVIDER", "json")
+    assert isinstance(json_provider.get_jsonifier(), json_provider.StdlibJSON)
+
+    with pytest.raises(ValueError):
+        json_provider.get_jsonifier("simplejson")
@@ -30,4 +30,196 @@ def test_register(api):
         assert ProdUser.login(email, "wrong_password") is None
 
         # Sign in with the correct password
-        assert ProdUser.login(email, password).id == user.id
\ No newline at end of file
+        assert ProdUser.login(email, password).id == user.id
+
+def test_login_rehash(api, monkeypatch):
+    client, app = api
+
+    from lib import passwords
+    from model import ProdUser
+
+    # Cheap parameters keep the test fast
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", "1024")
+
+    with app.app_context():
+        email = "bob@email.com"
+        password = "password"
+
+        user = ProdUser.register(email, password)
+
+        assert user.password_params == "scrypt:1024:8:1"
+        assert user.password_hash == passwords.scrypt(
+            password, user.salt, passwords.ScryptParams(1024, 8, 1)
+        )
+
+        # Changing the parameters rehashes on the next successful login
+        monkeypatch.setenv("PASSWORD_SCRYPT_N", "2048")
+
+        assert ProdUser.login(email, "wrong_password") is None
+        assert user.password_params == "scrypt:1024:8:1"
+
+        assert ProdUser.login(email, password).id == user.id
+        assert user.password_params == "scrypt:2048:8:1"
+        assert user.password_hash == passwords.scrypt(
+            password, user.salt, passwords.ScryptParams(2048, 8, 1)
+        )
+
+        assert ProdUser.login(email, password).id == user.id
+
+        # A busy hasher postpones the upgrade, the login still succeeds
+        monkeypatch.setenv("PASSWORD_SCRYPT_N", "4096")
+
+        hash_password = passwords.hash_password
+        calls = []
+
+        def busy_upgrade(password, salt, params=None):
+            calls.append(params)
+            if len(calls) > 1:
+                raise passwords.PasswordHasherBusy()
+
+            return hash_password(password, salt, params)
+
+        monkeypatch.setattr("lib.passwords.hash_password", busy_upgrade)
+
+        assert ProdUser.login(email, password).id == user.id
+        assert len(calls) == 2
+        assert user.password_params == "scrypt:2048:8:1"
+
+
+def test_password_hasher_busy(api, monkeypatch):
+    client, app = api
+
+    import pytest
+
+    from lib import passwords
+
+    hasher = passwords.PasswordHasher(workers=0, queue_size=1)
+    params = passwords.ScryptParams(1024, 8, 1)
+
+    assert hasher.hash("password", "salt", params) == passwords.scrypt(
+        "password", "salt", params
+    )
+
+    # Every slot taken, requests are refused instead of queued
+    hasher.slots.acquire()
+
+    with pytest.raises(passwords.PasswordHasherBusy):
+        hasher.hash("password", "salt", params)
+
+    monkeypatch.setattr("lib.passwords.get_password_hasher", lambda: hasher)
+
+    res = client.post("/prod/register/carol@email.com", json={"password": "password"})
+
+    assert res.status_code == 429
+    assert res.json["code"] == "too-many-requests"
+    assert res.headers["Retry-After"] == "1"
+
+    hasher.slots.release()
+
+    res = client.post("/prod/register/carol@email.com", json={"password": "password"})
+
+    assert res.status_code == 200
+
+
+def test_login(api, monkeypatch):
+    client, app = api
+
+    from lib import rate_limit
+
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", "1024")
+    rate_limit.get_rate_limiter().clear()
+
+    res = client.post("/prod/register/dave@email.com", json={"password": "password"})
+    assert res.status_code == 200
+
+    res = client.post("/prod/login/dave@email.com", json={"password": "password"})
+
+    assert res.status_code == 200
+    assert res.json["success"] == True
+    assert res.json["email"] == "dave@email.com"
+    assert res.json["stake_address"] is None
+
+    res = client.post("/prod/login/dave@email.com", json={"password": "wrong_password"})
+
+    assert res.status_code == 400
+    assert res.json["code"] == "invalid-credentials"
+
+    res = client.post("/prod/login/nobody@email.com", json={"password": "password"})
+
+    assert res.status_code == 400
+    assert res.json["code"] == "invalid-credentials"
+
+
+def test_login_rate_limit(api, monkeypatch):
+    client, app = api
+
+    from lib import rate_limit
+
+    rate_limit.get_rate_limiter().clear()
+
+    # Refused before the password is ever hashed
+    def hash_password(*args, **kwargs):
+        raise AssertionError("password hashed")
+
+    capacity, _ = rate_limit.LIMITS["account"]
+
+    for _ in range(capacity):
+        res = client.post("/prod/login/erin@email.com", json={"password": "password"})
+        assert res.status_code == 400
+
+    monkeypatch.setattr("lib.passwords.hash_password", hash_password)
+
+    res = client.post("/prod/login/erin@email.com", json={"password": "password"})
+
+    assert res.status_code == 429
+    assert res.json["code"] == "too-many-requests"
+    assert int(res.headers["Retry-After"]) >= 1
+
+    # Emails are limited case insensitively, and register shares the bucket
+    res = client.post("/prod/register/ERIN@email.com", json={"password": "password"})
+    assert res.status_code == 429
+
+    # Other accounts still have tokens, until the IP runs out
+    res = client.post("/prod/login/frank@email.com", json={"password": "password"})
+    assert res.status_code == 400
+
+    ip_capacity, _ = rate_limit.LIMITS["ip"]
+    statuses = [
+        client.post(
+            f"/prod/login/user{i}@email.com", json={"password": "password"}
+        ).status_code
+        for i in range(ip_capacity)
+    ]
+
+    assert statuses[-1] == 429
+
+
+def test_rate_limiter_backends(tmp_path, monkeypatch):
+    from lib import rate_limit
+
+    limits = {"account": (2, 60)}
+
+    memory = rate_limit.RateLimiter(rate_limit.MemoryBackend(), limits)
+
+    assert memory.retry_after(account="alice") is None
+    assert memory.retry_after(account="alice") is None
+    assert memory.retry_after(account="alice") == 30
+    assert memory.retry_after(account="bob") is None
+
+    # Tokens come back over time
+    now = rate_limit.time.monotonic()
+    monkeypatch.setattr("lib.rate_limit.time.monotonic", lambda: now + 30)
+    assert memory.retry_after(account="alice") is None
+
+    # Processes using the same file share their buckets
+    path = str(tmp_path / "rate_limit.db")
+    first = rate_limit.RateLimiter(rate_limit.SQLiteBackend(path), limits)
+    second = rate_limit.RateLimiter(rate_limit.SQLiteBackend(path), limits)
+
+    assert first.retry_after(account="alice") is None
+    assert second.retry_after(account="alice") is None
+    assert first.retry_after(account="alice") is not None
+    assert second.retry_after(account="alice") is not None
+
+    second.clear()
+    assert first.retry_after(account="alice") is None
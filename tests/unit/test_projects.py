@@ -204,6 +204,153 @@ def test_get_projects(api):
     }
 
 
+def test_get_projects_query_count(api):
+    client, app = api
+
+    sys.path.append("src")
+
+    from sqlalchemy import event
+    from model import db, Project, User, Subject, Deliverable, Funding
+
+    def create_projects(amount: int, offset: int):
+        for i in range(offset, offset + amount):
+            creator = User.sample()
+            mediators = [User.sample() for _ in range(2)]
+
+            project = Project(
+                creator=creator,
+                subjects=[Subject(subject_name="Math"), Subject(subject_name="Art")],
+                name=f"Project #{i}",
+                short_description="lorem ipsum...",
+                long_description="lorem ipsum dolor sit amet...",
+                days_to_complete=15,
+                deliverables=[Deliverable(deliverable="I am going to do it")],
+                mediators=mediators,
+            )
+
+            for _ in range(3):
+                db.session.add(
+                    Funding(
+                        funder=User.sample(),
+                        project=project,
+                        transaction_hash="hash",
+                        transaction_index=0,
+                        amount=10_000_000,
+                        status="submitted",
+                    )
+                )
+
+            db.session.add(project)
+
+        db.session.commit()
+
+    def count_queries(url: str):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *_):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        assert response.status_code == 200
+
+        return response, len(statements)
+
+    with app.app_context():
+        engine = db.engine
+        create_projects(1, 0)
+
+    response, single_project_queries = count_queries("/projects")
+    assert len(response.json["projects"]) == 1
+
+    with app.app_context():
+        create_projects(20, 1)
+
+    response, many_projects_queries = count_queries("/projects")
+    assert len(response.json["projects"]) == 21
+    assert all(len(project["funders"]) == 3 for project in response.json["projects"])
+    assert all(len(project["mediators"]) == 2 for project in response.json["projects"])
+
+    # Relationships are loaded per page, not per project
+    assert many_projects_queries == single_project_queries
+    assert many_projects_queries <= 8
+
+
+def test_get_projects_cursor(api):
+    client, app = api
+
+    sys.path.append("src")
+
+    from model import db, Project, User
+
+    with app.app_context():
+        creator = User.sample()
+
+        for i in range(5):
+            db.session.add(
+                Project(
+                    project_identifier=f"project_{i}",
+                    creator=creator,
+                    name=f"Project #{i}",
+                    short_description="lorem ipsum...",
+                    long_description="lorem ipsum dolor sit amet...",
+                    days_to_complete=15,
+                    # Two projects share a creation date so the id breaks the tie
+                    creation_date=datetime.datetime(2022, 6, 24 + i // 2, 12, 0, 0),
+                )
+            )
+
+        db.session.commit()
+
+    project_ids = []
+    cursor = None
+    for _ in range(3):
+        response = client.get(
+            "/projects?pagination=cursor&count=2"
+            + (f"&cursor={cursor}" if cursor is not None else "")
+        )
+
+        assert response.status_code == 200
+        assert "count" not in response.json
+
+        project_ids += [project["project_id"] for project in response.json["projects"]]
+        cursor = response.json["next_cursor"]
+
+    assert cursor is None
+    assert project_ids == [f"project_{i}" for i in reversed(range(5))]
+
+    response = client.get("/projects?pagination=cursor&count=2&order=asc")
+
+    assert response.status_code == 200
+    assert [project["project_id"] for project in response.json["projects"]] == [
+        "project_0",
+        "project_1",
+    ]
+
+    response = client.get(
+        f"/projects?pagination=cursor&order=asc&include_count=true"
+        f"&cursor={response.json['next_cursor']}"
+    )
+
+    assert response.status_code == 200
+    assert response.json["count"] == 5
+    assert response.json["next_cursor"] is None
+    assert [project["project_id"] for project in response.json["projects"]] == [
+        "project_2",
+        "project_3",
+        "project_4",
+    ]
+
+    response = client.get("/projects?pagination=cursor&cursor=foobar")
+
+    assert response.status_code == 400
+    assert response.json["code"] == "invalid-cursor"
+
+
 def test_create_project(api, monkeypatch):
     client, app = api
 
@@ -994,3 +1141,254 @@ def test_add_mediator(api, monkeypatch):
         project = projects[0]
 
         assert [mediator.id for mediator in project.mediators] == [1, 2]
+
+
+def test_get_project_etag(api, monkeypatch):
+    client, app = api
+
+    sys.path.append("src")
+
+    monkeypatch.setattr("api.projects.os.environ", {"API_KEY": "password"})
+
+    from model import db, Project, User
+
+    alice = User(
+        email="alice@email.com",
+        stake_address="stake_test_etag_alice",
+        payment_address="addr_test123",
+    )
+
+    bob = User(
+        email="bob@email.com",
+        stake_address="stake_test_etag_bob",
+        payment_address="addr_test456",
+    )
+
+    project = Project(
+        project_identifier="etag_project_id",
+        creator=alice,
+        name="Project",
+        short_description="lorem ipsum...",
+        long_description="lorem ipsum dolor sit amet...",
+        days_to_complete=15,
+        creation_date=datetime.datetime(2022, 6, 24, 12, 0, 0),
+    )
+
+    with app.app_context():
+        db.session.add(project)
+        db.session.add(bob)
+        db.session.commit()
+
+    response = client.get("/projects/etag_project_id")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.json["project"]["mediators"] == []
+
+    etag = response.headers["ETag"]
+
+    response = client.get("/projects/etag_project_id", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    # Served from the cache, changes made behind the API aren't seen
+    with app.app_context():
+        Project.query.filter(
+            Project.project_identifier == "etag_project_id"
+        ).first().name = "Renamed"
+        db.session.commit()
+
+    response = client.get("/projects/etag_project_id")
+
+    assert response.json["project"]["name"] == "Project"
+    assert response.headers["ETag"] == etag
+
+    # Writes through the API invalidate it
+    response = client.post(
+        "/projects/mediators/add/etag_project_id",
+        json={"mediator_stake_address": "stake_test_etag_bob", "api_key": "password"},
+    )
+
+    assert response.status_code == 200
+
+    response = client.get("/projects/etag_project_id", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json["project"]["name"] == "Renamed"
+    assert [
+        mediator["stake_address"] for mediator in response.json["project"]["mediators"]
+    ] == ["stake_test_etag_bob"]
+
+    response = client.get(
+        "/submissions/etag_project_id", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    # Not found isn't cached
+    assert client.get("/projects/unknown_project_id").status_code == 404
+    assert client.get("/projects/unknown_project_id").status_code == 404
+
+
+def test_get_project_uuid_spelling(api, monkeypatch):
+    client, app = api
+
+    sys.path.append("src")
+
+    monkeypatch.setattr("api.projects.os.environ", {"API_KEY": "password"})
+
+    from model import db, Project, User
+
+    project_identifier = "0190b2a4-5c3e-7d2a-8f1e-3b6a9c4d2e10"
+
+    project = Project(
+        project_identifier=project_identifier,
+        creator=User(
+            email="alice@email.com",
+            stake_address="stake_test_uuid_alice",
+            payment_address="addr_test123",
+        ),
+        name="Project",
+        short_description="lorem ipsum...",
+        long_description="lorem ipsum dolor sit amet...",
+        days_to_complete=15,
+        creation_date=datetime.datetime(2022, 6, 24, 12, 0, 0),
+    )
+    bob = User(
+        email="bob@email.com",
+        stake_address="stake_test_uuid_bob",
+        payment_address="addr_test456",
+    )
+
+    with app.app_context():
+        db.session.add(project)
+        db.session.add(bob)
+        db.session.commit()
+
+    # Identifiers are normalised before they are used as cache keys, so a
+    # write through any spelling invalidates every spelling
+    response = client.get(f"/projects/{project_identifier.upper()}")
+
+    assert response.status_code == 200
+    assert response.json["project"]["project_id"] == project_identifier
+
+    response = client.post(
+        f"/projects/mediators/add/{{{project_identifier}}}",
+        json={"mediator_stake_address": "stake_test_uuid_bob", "api_key": "password"},
+    )
+
+    assert response.status_code == 200
+
+    response = client.get(f"/projects/{project_identifier.upper()}")
+
+    assert [
+        mediator["stake_address"] for mediator in response.json["project"]["mediators"]
+    ] == ["stake_test_uuid_bob"]
+
+
+def test_get_projects_summary(api):
+    client, app = api
+
+    sys.path.append("src")
+
+    from sqlalchemy import event
+    from model import db, Project, User, Funding, Submission
+
+    with app.app_context():
+        engine = db.engine
+
+        for i in range(3):
+            project = Project(
+                project_identifier=f"summary_project_{i}",
+                creator=User.sample(),
+                name=f"Project #{i}",
+                short_description="lorem ipsum...",
+                long_description="lorem ipsum dolor sit amet...",
+                days_to_complete=15,
+                mediators=[User.sample() for _ in range(i)],
+                creation_date=datetime.datetime(2022, 6, 24, 12, 0, i),
+            )
+            project.submissions = [
+                Submission(project=project, title="Title", content="Content")
+                for _ in range(2 * i)
+            ]
+
+            db.session.add(
+                Funding(
+                    funder=User.sample(),
+                    project=project,
+                    transaction_hash="hash",
+                    transaction_index=0,
+                    amount=10_000_000,
+                    status="submitted",
+                )
+            )
+            db.session.add(project)
+            db.session.flush()
+
+            project.refresh_funding_totals()
+
+        db.session.commit()
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get("/projects?view=summary&order=asc")
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200
+    assert response.json == {
+        "count": 3,
+        "projects": [
+            {
+                "project_id": f"summary_project_{i}",
+                "name": f"Project #{i}",
+                "short_description": "lorem ipsum...",
+                "total_funding_amount": 10_000_000,
+                "funder_count": 1,
+                "mediator_count": i,
+                "submission_count": 2 * i,
+            }
+            for i in range(3)
+        ],
+    }
+
+    # The page and its count, no relationship is loaded
+    assert len(statements) == 2
+    assert not any("long_description" in statement for statement in statements)
+
+    response = client.get(
+        "/projects?fields=name,mediator_count&pagination=cursor&count=2"
+    )
+
+    assert response.status_code == 200
+    assert response.json["projects"] == [
+        {"name": "Project #2", "mediator_count": 2},
+        {"name": "Project #1", "mediator_count": 1},
+    ]
+
+    response = client.get(
+        f"/projects?fields=name,mediator_count&pagination=cursor&count=2"
+        f"&cursor={response.json['next_cursor']}"
+    )
+
+    assert response.json["projects"] == [{"name": "Project #0", "mediator_count": 0}]
+    assert response.json["next_cursor"] is None
+
+    response = client.get("/projects?fields=name,name&order=asc&count=1")
+
+    assert response.json["projects"] == [{"name": "Project #0"}]
+
+    response = client.get("/projects?fields=name,long_description")
+
+    assert response.status_code == 400
+    assert response.json["code"] == "invalid-fields"
@@ -1,6 +1,7 @@
 from fixtures import api
 
 import datetime
+import json
 
 
 def test_create_quiz(api):
@@ -49,6 +50,93 @@ def test_create_quiz(api):
     ]
 
 
+def test_import_quizzes(api):
+    client, app = api
+
+    from model import Quiz, User, db
+
+    with app.app_context():
+        db.session.add(User.sample(stake_address="stake_test123"))
+        db.session.commit()
+
+    question = {
+        "question": "What is the capital of Brazil?",
+        "answers": ["Brasilia", "Rio de Janeiro"],
+        "hints": ["Think about it's name"],
+        "right_answer": 0,
+    }
+
+    body = "\n".join(
+        [
+            json.dumps(
+                {
+                    "creator_name": "Alice",
+                    "creator_stake_address": "stake_test123",
+                    "questions": [question],
+                }
+            ),
+            "",
+            "{not json",
+            json.dumps(
+                {
+                    "creator_name": "Bob",
+                    "questions": [{**question, "right_answer": 2, "hints": None}],
+                }
+            ),
+            json.dumps({"creator_name": "Bob", "questions": [question, question]}),
+        ]
+    )
+
+    res = client.post(
+        "/quiz/import", data=body, content_type="application/x-ndjson"
+    )
+
+    assert res.status_code == 200
+    assert res.json["success"] is False
+    assert res.json["imported"] == 2
+    assert [quiz["row"] for quiz in res.json["quizzes"]] == [1, 5]
+    assert res.json["errors"][0]["row"] == 3
+    assert res.json["errors"][1] == {
+        "row": 4,
+        "errors": [
+            "questions[0].right_answer: 2 is not an index of the 2 answers",
+            "questions[0].hints: must be a list of strings",
+        ],
+    }
+
+    with app.app_context():
+        quiz = Quiz.find(res.json["quizzes"][0]["quiz_id"])
+
+        assert quiz.creator.stake_address == "stake_test123"
+        assert quiz.creator_name == "Alice"
+        assert quiz.questions == [question]
+        assert quiz.version == 1
+        assert quiz.current_limit == 100
+
+        assert len(Quiz.find(res.json["quizzes"][1]["quiz_id"]).questions) == 2
+
+    csv_body = "\n".join(
+        [
+            "id,creator_name,questions",
+            f'1,Carol,"{json.dumps([question]).replace(chr(34), chr(34) * 2)}"',
+            "2,Dave,[]",
+        ]
+    )
+
+    res = client.post(
+        "/quiz/import?format=csv", data=csv_body, content_type="text/csv"
+    )
+
+    assert res.status_code == 200
+    assert res.json["imported"] == 1
+    assert res.json["errors"] == [
+        {"row": 2, "errors": ["questions: must be a non empty list"]}
+    ]
+
+    with app.app_context():
+        assert Quiz.query.count() == 3
+
+
 def test_assign_quiz(api):
     client, app = api
 
@@ -85,6 +173,94 @@ def test_assign_quiz(api):
     assert res.status_code == 200
 
 
+def test_bulk_assign_quiz(api):
+    client, app = api
+
+    from model import Quiz, QuizAssignment, User, db
+
+    with app.app_context():
+        alice = User.sample(stake_address="stake_test123")
+        bob = User.sample(stake_address="stake_test456")
+        quiz_1 = Quiz.sample()
+        quiz_2 = Quiz.sample()
+        existing = QuizAssignment.sample(assignee=alice, quiz=quiz_1)
+
+        db.session.add_all([alice, bob, quiz_1, quiz_2, existing])
+        db.session.commit()
+
+        quiz_1_id = quiz_1.quiz_identifier
+        quiz_2_id = quiz_2.quiz_identifier
+        existing_id = existing.quiz_assignment_identifier
+
+    res = client.post(
+        "/quiz/assign/bulk",
+        json={
+            "assignments": [
+                {"quiz_id": quiz_1_id, "user_stake_address": "stake_test123"},
+                {"quiz_id": quiz_1_id, "user_stake_address": "stake_test456"},
+                {"quiz_id": quiz_2_id, "user_stake_address": "stake_test123"},
+                {"quiz_id": "unknown_quiz", "user_stake_address": "stake_test123"},
+                {"quiz_id": quiz_2_id, "user_stake_address": "stake_test789"},
+            ]
+        },
+    )
+
+    assert res.status_code == 200
+
+    results = res.json["results"]
+
+    assert [result["status"] for result in results] == [
+        "existing",
+        "created",
+        "created",
+        "quiz-not-found",
+        "user-not-found",
+    ]
+    assert results[0]["quiz_assignment_id"] == existing_id
+    assert results[3]["quiz_assignment_id"] is None
+
+    with app.app_context():
+        assert QuizAssignment.query.count() == 3
+
+        assignment = QuizAssignment.query.filter(
+            QuizAssignment.quiz_assignment_identifier
+            == results[1]["quiz_assignment_id"]
+        ).first()
+
+        assert assignment.assignee.stake_address == "stake_test456"
+        assert assignment.quiz.quiz_identifier == quiz_1_id
+        assert assignment.current_question == 0
+        assert assignment.remaining_attempts == 3
+        assert assignment.creation_date is not None
+
+    # Running it again creates nothing new
+    res = client.post(
+        "/quiz/assign/bulk",
+        json={
+            "assignments": [
+                {"quiz_id": quiz_1_id, "user_stake_address": "stake_test456"},
+            ]
+        },
+    )
+
+    assert res.status_code == 200
+    assert res.json["results"][0]["status"] == "existing"
+    assert res.json["results"][0]["quiz_assignment_id"] == results[1]["quiz_assignment_id"]
+
+    # Other spellings of the quiz UUID find the same quiz
+    res = client.post(
+        "/quiz/assign/bulk",
+        json={
+            "assignments": [
+                {"quiz_id": quiz_2_id.upper(), "user_stake_address": "stake_test123"},
+            ]
+        },
+    )
+
+    assert res.json["results"][0]["status"] == "existing"
+    assert res.json["results"][0]["quiz_id"] == quiz_2_id
+
+
 def test_get_quiz(api, monkeypatch):
     client, app = api
 
@@ -133,6 +309,27 @@ def test_get_quiz(api, monkeypatch):
         "creation_date": "2012/12/12 12:12:12",
     }
 
+    etag = res.headers["ETag"]
+
+    res = client.get("/quiz/quiz_id", headers={"If-None-Match": etag})
+
+    assert res.status_code == 304
+
+    # current_limit is changed outside the API, the bumped version is a miss
+    with app.app_context():
+        db.session.execute(
+            Quiz.__table__.update()
+            .where(Quiz.quiz_identifier == "quiz_id")
+            .values(current_limit=5)
+        )
+        db.session.commit()
+
+    res = client.get("/quiz/quiz_id", headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+    assert res.json["current_limit"] == 5
+    assert res.headers["ETag"] != etag
+
 
 def test_get_quiz_assignement(api):
     # Should return information about the quiz assignment,
@@ -327,6 +524,154 @@ def test_attempt_answer(api, monkeypatch):
         }
 
 
+def test_attempt_answer_single_commit(api, monkeypatch):
+    client, app = api
+
+    monkeypatch.setattr("lib.auth_tools.validate_signature", lambda *_: True)
+
+    from sqlalchemy import event
+    from model import Quiz, QuizAssignment, AttemptAnswer, db
+
+    quiz_assignment = QuizAssignment.sample(
+        quiz=Quiz.sample(
+            questions=[
+                {
+                    "question": "What is the capital of Brazil?",
+                    "answers": ["Brasilia", "Rio de Janeiro"],
+                    "hints": ["Think about it's name"],
+                    "right_answer": 0,
+                }
+            ]
+        ),
+        remaining_attempts=1,
+    )
+
+    with app.app_context():
+        db.session.add(quiz_assignment)
+        db.session.commit()
+        db.session.refresh(quiz_assignment)
+
+        quiz = quiz_assignment.quiz
+        engine = db.engine
+
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", on_commit)
+    try:
+        res = client.post(
+            f"/quiz/attempt/{quiz_assignment.quiz_assignment_identifier}",
+            json={"answer": 1, "signature": "sample_signature"},
+        )
+    finally:
+        event.remove(engine, "commit", on_commit)
+
+    assert res.status_code == 200
+    assert res.json == {
+        "right_answer": False,
+        "state": "completed_failure",
+        "remaining_attempts": 0,
+    }
+
+    # Attempt and state transition are written in the same transaction
+    assert len(commits) == 1
+
+    # Completed assignments do not accept more attempts
+    res = client.post(
+        f"/quiz/attempt/{quiz_assignment.quiz_assignment_identifier}",
+        json={"answer": 0, "signature": "sample_signature"},
+    )
+
+    assert res.status_code == 400
+    assert res.json["code"] == "quiz-assignment-completed"
+
+    with app.app_context():
+        assert AttemptAnswer.query.count() == 1
+        assert AttemptAnswer.quiz_stats(quiz, 0) == {1: 1}
+
+
+def test_bulk_create_powerup(api):
+    client, app = api
+
+    from model import Quiz, QuizAssignment, PowerUp, db
+
+    with app.app_context():
+        quiz = Quiz.sample()
+        other_quiz = Quiz.sample()
+
+        with_hints = QuizAssignment.sample(
+            quiz=quiz, powerups=[PowerUp(name="get_hints", used=True)]
+        )
+        in_progress = QuizAssignment.sample(quiz=quiz, powerups=[])
+        completed = QuizAssignment.sample(
+            quiz=quiz, powerups=[], completed_success=True
+        )
+        other = QuizAssignment.sample(quiz=other_quiz, powerups=[])
+
+        db.session.add_all([with_hints, in_progress, completed, other])
+        db.session.commit()
+
+        quiz_id = quiz.quiz_identifier
+        with_hints_id = with_hints.quiz_assignment_identifier
+        in_progress_id = in_progress.quiz_assignment_identifier
+        other_id = other.quiz_assignment_identifier
+
+    res = client.post("/quiz/powerup/bulk", json={"powerups": ["get_hints"]})
+
+    assert res.status_code == 400
+    assert res.json["code"] == "missing-quiz-assignment-filter"
+
+    # Unknown powerups would only fail once used, they are refused up front
+    res = client.post(
+        "/quiz/powerup/bulk",
+        json={"quiz_id": quiz_id, "powerups": ["get_hints", "win_quiz"]},
+    )
+
+    assert res.status_code == 400
+    assert res.json["code"] == "unknown-powerup"
+
+    with app.app_context():
+        assert PowerUp.query.filter(PowerUp.name == "win_quiz").count() == 0
+
+    res = client.post(
+        "/quiz/powerup/bulk",
+        json={"quiz_id": quiz_id, "powerups": ["get_hints", "skip_question"]},
+    )
+
+    assert res.status_code == 200
+    assert res.json["created"] == 3
+    assert sorted(res.json["quiz_assignment_ids"]) == sorted(
+        [with_hints_id, in_progress_id]
+    )
+
+    # Granting again is a no-op
+    res = client.post(
+        "/quiz/powerup/bulk",
+        json={
+            "quiz_assignment_ids": [in_progress_id, other_id],
+            "powerups": ["skip_question", "skip_question"],
+        },
+    )
+
+    assert res.status_code == 200
+    assert res.json["created"] == 1
+
+    with app.app_context():
+        powerups = {
+            identifier: sorted(powerup.name for powerup in quiz_assignment.powerups)
+            for quiz_assignment in QuizAssignment.query.all()
+            for identifier in [quiz_assignment.quiz_assignment_identifier]
+        }
+
+        assert powerups[with_hints_id] == ["get_hints", "skip_question"]
+        assert powerups[in_progress_id] == ["get_hints", "skip_question"]
+        assert powerups[other_id] == ["skip_question"]
+        assert PowerUp.query.filter(PowerUp.used.is_(True)).count() == 1
+        assert PowerUp.query.count() == 5
+
+
 def test_activate_powerup(api, monkeypatch):
     client, app = api
 
@@ -662,3 +1007,83 @@ def test_create_powerup(api, monkeypatch):
         print(res.json)
         assert res.status_code == 200
         assert res.json == expected_response
+
+
+def test_quiz_definition_cache(api):
+    client, app = api
+
+    from model import Quiz, User, db
+    from model.quiz import quiz_definitions
+
+    questions = [
+        {
+            "question": "What is the capital of Brazil?",
+            "answers": ["Brasilia", "Rio de Janeiro"],
+            "hints": ["Think about it's name"],
+            "right_answer": 0,
+        }
+    ]
+
+    with app.app_context():
+        quiz = Quiz.sample(creator=User.sample(), questions=questions)
+
+        db.session.add(quiz)
+        db.session.commit()
+
+        definition = quiz.definition()
+
+        assert definition.questions == questions
+        assert definition.public_questions == [
+            {
+                "question": "What is the capital of Brazil?",
+                "answers": ["Brasilia", "Rio de Janeiro"],
+            }
+        ]
+
+        quiz_id = quiz.quiz_identifier
+
+    # A freshly loaded quiz reuses the parsed definition
+    with app.app_context():
+        quiz = Quiz.find(quiz_id)
+
+        assert quiz.definition() is definition
+        assert "questions" not in quiz.__dict__
+
+        # Any change to the quiz invalidates the cached definition
+        quiz.current_limit = 0
+        db.session.commit()
+
+        assert quiz.version == 2
+        assert quiz.definition() is not definition
+
+        quiz.questions = questions + [
+            {
+                "question": "Am I gonna give you up?",
+                "answers": ["Yes", "No", "Never"],
+                "hints": ["Am I gonna let you down?"],
+                "right_answer": 2,
+            }
+        ]
+        db.session.commit()
+
+        assert len(quiz.definition().questions) == 2
+
+    res = client.get(f"/quiz/{quiz_id}")
+
+    assert res.status_code == 200
+    assert len(res.json["questions"]) == 2
+    assert res.json["current_limit"] == 0
+    assert len(quiz_definitions) == 3
+
+    # Updates made outside the ORM bump the version through the trigger
+    with app.app_context():
+        db.session.execute(
+            db.text("UPDATE quiz SET questions = :questions WHERE quiz_identifier = :id"),
+            {"questions": json.dumps(questions), "id": quiz_id},
+        )
+        db.session.commit()
+
+        quiz = Quiz.find(quiz_id)
+
+        assert quiz.version == 4
+        assert len(quiz.definition().questions) == 1
@@ -0,0 +1,190 @@
+import threading
+import sys
+
+
+def test_get_cardano_handler(monkeypatch):
+    sys.path.append("src")
+
+    from lib import script_tools
+
+    monkeypatch.setattr(
+        "os.environ",
+        {
+            "BLOCKFROST_PROJECT_ID": "<project_id>",
+            "BLOCKFROST_BASE_URL": "<project_base_url>",
+            "NETWORK_MODE": "testnet",
+            "SCRIPT_PATH": "./script/script.plutus",
+            "MEDIATOR_POLICY": "<mediator_policy>",
+        },
+    )
+
+    chain_contexts = []
+
+    class ChainContext:
+        def __init__(self, project_id, base_url, network):
+            chain_contexts.append(self)
+
+    monkeypatch.setattr("lib.script_tools.pyc.BlockFrostChainContext", ChainContext)
+
+    now = [1000.0]
+    monkeypatch.setattr("lib.script_tools.time.monotonic", lambda: now[0])
+
+    script_tools.reset_cardano_handler()
+
+    handler = script_tools.get_cardano_handler(ttl=60)
+
+    with open("./script/script.plutus", "r") as f:
+        assert handler["script"] == f.read()
+
+    assert handler["mediator_policy"] == "<mediator_policy>"
+    assert handler["chain_context"] is chain_contexts[0]
+
+    # Reused while the chain context is fresh
+    now[0] += 59
+    assert script_tools.get_cardano_handler(ttl=60) is handler
+    assert len(chain_contexts) == 1
+
+    # Chain context is rebuilt once the ttl expires
+    now[0] += 1
+    refreshed_handler = script_tools.get_cardano_handler(ttl=60)
+
+    assert len(chain_contexts) == 2
+    assert refreshed_handler["chain_context"] is chain_contexts[1]
+    assert refreshed_handler["script"] == handler["script"]
+
+    # Other requests keep the stale handler while the chain context is rebuilt
+    building = threading.Event()
+    release = threading.Event()
+
+    class SlowChainContext(ChainContext):
+        def __init__(self, **kwargs):
+            building.set()
+            release.wait(5)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(
+        "lib.script_tools.pyc.BlockFrostChainContext", SlowChainContext
+    )
+
+    now[0] += 60
+    refreshing = threading.Thread(target=script_tools.get_cardano_handler, args=(60,))
+    refreshing.start()
+    assert building.wait(5)
+
+    assert script_tools.get_cardano_handler(ttl=60) is refreshed_handler
+
+    release.set()
+    refreshing.join()
+
+    assert len(chain_contexts) == 3
+    refreshed_handler = script_tools.get_cardano_handler(ttl=60)
+    assert refreshed_handler["chain_context"] is chain_contexts[2]
+
+    monkeypatch.setattr("lib.script_tools.pyc.BlockFrostChainContext", ChainContext)
+
+    # Reset forces a full initialisation
+    script_tools.reset_cardano_handler()
+    assert script_tools.get_cardano_handler(ttl=60) is not refreshed_handler
+    assert len(chain_contexts) == 4
+
+    script_tools.reset_cardano_handler()
+
+
+def test_compile_script():
+    sys.path.append("src")
+
+    import cbor2
+    import pycardano as pyc
+
+    from lib import script_tools
+
+    script_tools.compile_script.cache_clear()
+
+    with open("./script/script.plutus", "r") as f:
+        script_hex = f.read()
+
+    compiled = script_tools.compile_script(script_hex)
+
+    script = pyc.PlutusV2Script(cbor2.loads(bytes.fromhex(script_hex)))
+    script_hash = pyc.plutus_script_hash(script)
+
+    assert compiled.script == script
+    assert compiled.script_hash == script_hash
+    assert compiled.address(pyc.Network.TESTNET) == pyc.Address(
+        script_hash, network=pyc.Network.TESTNET
+    )
+    assert compiled.address(pyc.Network.MAINNET) == pyc.Address(
+        script_hash, network=pyc.Network.MAINNET
+    )
+
+    # Same content is decoded only once, different versions are kept apart
+    assert script_tools.compile_script(script_hex) is compiled
+
+    with open("./script/v1.plutus", "r") as f:
+        other_compiled = script_tools.compile_script(f.read())
+
+    assert other_compiled.script_hash != compiled.script_hash
+    assert script_tools.compile_script.cache_info().misses == 2
+
+
+def test_cbor_to_utxos(monkeypatch):
+    sys.path.append("src")
+
+    import cbor2
+    import pytest
+    import pycardano as pyc
+
+    from lib import script_tools
+
+    address = pyc.Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    datum_hash = pyc.DatumHash(bytes(32))
+    multi_asset = pyc.MultiAsset.from_primitive({bytes(28): {b"token": 10}})
+
+    outputs = [
+        # Legacy outputs: lovelace, multi asset, datum hash
+        [address.to_primitive(), 2_000_000],
+        [address.to_primitive(), [2_000_000, multi_asset.to_primitive()]],
+        [address.to_primitive(), 2_000_000, datum_hash.to_primitive()],
+        # Post alonzo output with an inline datum
+        {0: address.to_primitive(), 1: 2_000_000, 2: [1, cbor2.CBORTag(24, b"\x00")]},
+    ]
+
+    utxo_cbors = [
+        cbor2.dumps([[bytes([i]) * 32, i], output]).hex()
+        for i, output in enumerate(outputs)
+    ]
+
+    utxos = script_tools.cbor_to_utxos(utxo_cbors)
+
+    # Same result as decoding them one by one
+    assert utxos == [script_tools.cbor_to_utxo(utxo) for utxo in utxo_cbors]
+    assert utxos[1].output.amount.multi_asset == multi_asset
+    assert utxos[3].input.index == 3
+
+    with pytest.raises(ValueError, match="Duplicate UTxO"):
+        script_tools.cbor_to_utxos([utxo_cbors[0], utxo_cbors[1], utxo_cbors[0]])
+
+    with pytest.raises(ValueError, match="Invalid UTxO at index 1"):
+        script_tools.cbor_to_utxos([utxo_cbors[0], "not cbor"])
+
+    with pytest.raises(ValueError, match="Invalid UTxO at index 0"):
+        script_tools.cbor_to_utxos([cbor2.dumps([1, 2, 3]).hex()])
+
+    # Malformed addresses, hashes and amounts are invalid input too
+    with pytest.raises(ValueError, match="Invalid UTxO at index 0"):
+        script_tools.cbor_to_utxos([cbor2.dumps([[bytes(31), 0], outputs[0]]).hex()])
+
+    with pytest.raises(ValueError, match="Invalid UTxO at index 0"):
+        script_tools.cbor_to_utxos(
+            [cbor2.dumps([[bytes(32), 0], [address.to_primitive(), [1, 2]]]).hex()]
+        )
+
+    # Anything else is a bug and isn't reported as bad input
+    def broken(output):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(script_tools, "output_from_primitive", broken)
+    with pytest.raises(RuntimeError, match="bug"):
+        script_tools.cbor_to_utxos(utxo_cbors)
@@ -0,0 +1,218 @@
+import threading
+import sys
+
+from fixtures import api
+
+
+def test_fund_project_submitted(api, monkeypatch):
+    client, app = api
+
+    sys.path.append("src")
+
+    monkeypatch.setattr("lib.auth_tools.validate_signature", lambda *_: True)
+
+    from model import db, Project, User, Funding
+
+    alice = User.sample()
+    bob = User.sample()
+
+    project = Project(
+        project_identifier="project_id",
+        creator=User.sample(),
+        name="Project",
+        short_description="lorem ipsum...",
+        long_description="lorem ipsum dolor sit amet...",
+        days_to_complete=15,
+    )
+
+    with app.app_context():
+        db.session.add(project)
+        db.session.add(alice)
+        db.session.add(bob)
+        db.session.commit()
+        db.session.refresh(alice)
+        db.session.refresh(bob)
+
+    for funder, amount in [(alice, 10_000_000), (bob, 5_000_000), (alice, 1_000_000)]:
+        response = client.post(
+            "/transaction/projects/fund/submitted",
+            json={
+                "stake_address": funder.stake_address,
+                "transaction_hash": "hash",
+                "funding_amount": amount,
+                "project_id": "project_id",
+                "signature": "sample_signature",
+            },
+        )
+
+        assert response.status_code == 200
+
+    response = client.get("/projects/project_id")
+
+    assert response.status_code == 200
+    assert response.json["project"]["total_funding_amount"] == 16_000_000
+    assert len(response.json["project"]["funders"]) == 3
+
+    with app.app_context():
+        project = Project.query.filter(
+            Project.project_identifier == "project_id"
+        ).first()
+
+        assert project.total_funding_amount == 16_000_000
+        assert project.onchain_funding_amount == 0
+        assert project.funder_count == 2
+
+        funding = Funding.query.filter(Funding.funder_id == bob.id).first()
+        funding.update_status("onchain")
+        db.session.commit()
+
+        assert project.total_funding_amount == 11_000_000
+        assert project.onchain_funding_amount == 5_000_000
+        assert project.funder_count == 2
+
+        # Alice still has another counted funding, bob doesn't
+        funding = Funding.query.filter(Funding.funder_id == alice.id).first()
+        funding.update_status("expired")
+        db.session.commit()
+
+        assert project.total_funding_amount == 1_000_000
+        assert project.funder_count == 2
+
+        funding = Funding.query.filter(Funding.funder_id == bob.id).first()
+        funding.update_status("expired")
+        db.session.commit()
+
+        assert project.onchain_funding_amount == 0
+        assert project.funder_count == 1
+
+        # Same totals as recomputing them from every funding
+        totals = (
+            project.total_funding_amount,
+            project.onchain_funding_amount,
+            project.funder_count,
+        )
+        project.refresh_funding_totals()
+
+        assert totals == (
+            project.total_funding_amount,
+            project.onchain_funding_amount,
+            project.funder_count,
+        )
+
+
+def test_fund_project_job(api, monkeypatch, tmp_path):
+    client, app = api
+
+    sys.path.append("src")
+
+    monkeypatch.setattr("lib.auth_tools.validate_signature", lambda *_: True)
+    monkeypatch.setenv("TRANSACTION_JOBS_DB", str(tmp_path / "jobs.db"))
+
+    from types import SimpleNamespace
+    from lib import jobs
+    from model import db, Project, User, Funding
+
+    built = threading.Event()
+
+    def create_transaction_fund_project(*_):
+        # Stands in for the blocking chain context queries
+        built.wait(5)
+
+        return SimpleNamespace(
+            transaction_body=SimpleNamespace(id="tx_hash", to_cbor=lambda: "body"),
+            transaction_witness_set=SimpleNamespace(to_cbor=lambda: "witness"),
+        )
+
+    monkeypatch.setattr(
+        "lib.script_tools.get_cardano_handler",
+        lambda: {"chain_context": None, "script": None, "mediator_policy": "00"},
+    )
+    monkeypatch.setattr("lib.script_tools.cbor_to_utxos", lambda utxos: utxos)
+    monkeypatch.setattr("pycardano.Address.from_primitive", lambda address: address)
+    monkeypatch.setattr(
+        "lib.script_tools.create_transaction_fund_project",
+        create_transaction_fund_project,
+    )
+
+    alice = User.sample()
+    project = Project(
+        project_identifier="job_project_id",
+        creator=User.sample(),
+        name="Project",
+        short_description="lorem ipsum...",
+        long_description="lorem ipsum dolor sit amet...",
+        days_to_complete=15,
+    )
+
+    with app.app_context():
+        db.session.add_all([alice, project])
+        db.session.commit()
+        db.session.refresh(alice)
+
+    jobs.reset_job_queue()
+
+    response = client.post(
+        "/transaction/projects/fund?mode=job",
+        json={
+            "stake_address": alice.stake_address,
+            "funding_utxos": ["utxo"],
+            "funding_amount": 1_000_000,
+            "project_id": "job_project_id",
+            "signature": "sample_signature",
+        },
+    )
+
+    assert response.status_code == 202
+    job_id = response.json["job_id"]
+
+    # The request returned before the transaction was built
+    response = client.get(f"/transaction/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json["status"] in ("pending", "running")
+
+    built.set()
+    jobs.get_job_queue().shutdown()
+
+    response = client.get(f"/transaction/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json == {
+        "job_id": job_id,
+        "status": "done",
+        "transaction_cbor": "body",
+        "witness_cbor": "witness",
+    }
+
+    # Other processes read it from the same SQLite file
+    assert jobs.SQLiteJobStore(str(tmp_path / "jobs.db")).get(job_id)["status"] == "done"
+
+    with app.app_context():
+        funding = Funding.query.filter(Funding.transaction_hash == "tx_hash").first()
+
+        assert funding.amount == 1_000_000
+        assert funding.project.project_identifier == "job_project_id"
+
+    response = client.get("/transaction/jobs/unknown")
+    assert response.status_code == 404
+
+    jobs.reset_job_queue()
+
+
+def test_job_queue_failure():
+    sys.path.append("src")
+
+    from lib import jobs
+
+    queue = jobs.JobQueue(jobs.MemoryJobStore(), workers=1)
+
+    def fail():
+        raise ValueError("Blockfrost is down")
+
+    job_id = queue.submit(fail)
+    queue.shutdown()
+
+    assert queue.get(job_id) == {
+        "job_id": job_id,
+        "status": "failed",
+        "message": "Blockfrost is down",
+    }
+    assert queue.get("unknown") is None
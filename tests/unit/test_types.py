@@ -0,0 +1,66 @@
+import sys
+import uuid
+
+
+def test_uuid7():
+    sys.path.append("src")
+
+    from model.types import uuid7
+
+    identifiers = [uuid7() for _ in range(100)]
+
+    assert all(identifier.version == 7 for identifier in identifiers)
+    assert all(identifier.variant == uuid.RFC_4122 for identifier in identifiers)
+    assert len(set(identifiers)) == 100
+
+    # Ordered by creation time (up to the millisecond)
+    timestamps = [identifier.int >> 80 for identifier in identifiers]
+    assert timestamps == sorted(timestamps)
+
+
+def test_uuid_string():
+    sys.path.append("src")
+
+    from sqlalchemy.dialects import postgresql, sqlite
+    from sqlalchemy.schema import CreateTable
+
+    from model import Project
+    from model.types import UUIDString
+
+    identifier = "473ca642-d238-4b93-b7e4-424a76128727"
+
+    assert "project_identifier UUID" in str(
+        CreateTable(Project.__table__).compile(dialect=postgresql.dialect())
+    )
+    assert "project_identifier VARCHAR(64)" in str(
+        CreateTable(Project.__table__).compile(dialect=sqlite.dialect())
+    )
+
+    uuid_string = UUIDString()
+
+    assert uuid_string.process_bind_param(
+        identifier, postgresql.dialect()
+    ) == uuid.UUID(identifier)
+    assert uuid_string.process_bind_param("id", postgresql.dialect()) is None
+    assert uuid_string.process_bind_param("id", sqlite.dialect()) == "id"
+
+    assert (
+        uuid_string.process_result_value(uuid.UUID(identifier), postgresql.dialect())
+        == identifier
+    )
+
+
+def test_canonical_uuid():
+    sys.path.append("src")
+
+    from model.types import canonical_uuid
+
+    identifier = "473ca642-d238-4b93-b7e4-424a76128727"
+
+    assert canonical_uuid(identifier) == identifier
+    assert canonical_uuid(identifier.upper()) == identifier
+    assert canonical_uuid(identifier.replace("-", "")) == identifier
+    assert canonical_uuid(f"{{{identifier}}}") == identifier
+
+    # Identifiers that aren't UUIDs are kept as they are
+    assert canonical_uuid("quiz_id") == "quiz_id"
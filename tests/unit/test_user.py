@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import os
 import datetime
 
 from fixtures import api
@@ -316,4 +317,125 @@ def test_get_users(api):
                 "project_count": 0,
             },
         ],
-    }
\ No newline at end of file
+    }
+
+def test_get_users_cursor(api):
+    client, app = api
+
+    sys.path.append("src")
+
+    from model import db, User
+
+    with app.app_context():
+        for i in range(3):
+            db.session.add(
+                User.sample(
+                    stake_address=f"stake_test{i}",
+                    creation_date=datetime.datetime(2022, 6, 24, 12, 0, i),
+                )
+            )
+
+        db.session.commit()
+
+    response = client.get("/users?pagination=cursor&count=2&include_count=true")
+
+    assert response.status_code == 200
+    assert response.json["total"] == 3
+    assert [user["stake_address"] for user in response.json["users"]] == [
+        "stake_test2",
+        "stake_test1",
+    ]
+
+    response = client.get(
+        f"/users?pagination=cursor&count=2&cursor={response.json['next_cursor']}"
+    )
+
+    assert response.status_code == 200
+    assert "total" not in response.json
+    assert response.json["next_cursor"] is None
+    assert [user["stake_address"] for user in response.json["users"]] == [
+        "stake_test0",
+    ]
+
+
+def test_create_session(api, monkeypatch):
+    client, app = api
+
+    sys.path.append("src")
+
+    from model import db, User, Quiz, QuizAssignment
+
+    monkeypatch.setattr(
+        "lib.auth_tools.validate_signature",
+        lambda signature, _: signature == "valid_signature",
+    )
+
+    quiz_assignment = QuizAssignment.sample(
+        assignee=User.sample(stake_address="stake_test123"),
+        quiz=Quiz.sample(),
+    )
+
+    with app.app_context():
+        db.session.add(quiz_assignment)
+        db.session.commit()
+        db.session.refresh(quiz_assignment)
+
+    response = client.post(
+        "/session/stake_test123", json={"signature": "invalid_signature"}
+    )
+
+    assert response.status_code == 400
+    assert response.json["code"] == "invalid-signature"
+
+    # User is not registered
+    response = client.post(
+        "/session/stake_test456", json={"signature": "valid_signature"}
+    )
+
+    assert response.status_code == 400
+
+    response = client.post(
+        "/session/stake_test123", json={"signature": "valid_signature"}
+    )
+
+    assert response.status_code == 200
+
+    token = response.json["token"]
+
+    # Session token is accepted instead of a signature
+    response = client.post(
+        f"/quiz/attempt/{quiz_assignment.quiz_assignment_identifier}",
+        json={"answer": 0},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json["right_answer"] is True
+
+    response = client.post(
+        f"/quiz/attempt/{quiz_assignment.quiz_assignment_identifier}",
+        json={"answer": 0},
+        headers={"Authorization": "Bearer foobar"},
+    )
+
+    assert response.status_code == 400
+    assert response.json["code"] == "invalid-signature"
+
+    # Session tokens are disabled without a secret
+    monkeypatch.delitem(os.environ, "SESSION_SECRET")
+
+    response = client.post(
+        "/session/stake_test123", json={"signature": "valid_signature"}
+    )
+
+    assert response.status_code == 503
+    assert response.json["code"] == "sessions-disabled"
+
+    response = client.post(
+        f"/quiz/attempt/{quiz_assignment.quiz_assignment_identifier}",
+        json={"answer": 0},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 400
+    assert response.json["code"] == "invalid-signature"